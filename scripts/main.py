@@ -1,3 +1,4 @@
+import logging
 import pygame
 import sys
 from typing import Tuple
@@ -11,13 +12,19 @@ from warhammer40k_ai.waha_helper import WahaHelper
 from warhammer40k_ai.agents.hrl_agent import HighLevelAgent, TacticalAgent, LowLevelAgent
 
 
+logger = logging.getLogger(__name__)
+
 # Helper
 waha_helper = WahaHelper()
 
-def initialize_game() -> Tuple[pygame.Surface, WarhammerEnv, Game, Map, float, int, int, Player, Player]:
+# Frame rate cap for the main loop
+FPS = 60
+
+def initialize_game() -> Tuple[pygame.Surface, WarhammerEnv, Game, Map, float, int, int, Player, Player, pygame.time.Clock]:
     pygame.init()
     screen = pygame.display.set_mode((BATTLEFIELD_WIDTH + 2 * ROSTER_PANE_WIDTH, BATTLEFIELD_HEIGHT + INFO_PANE_HEIGHT))
     pygame.display.set_caption('Warhammer 40,000 Battlefield')
+    clock = pygame.time.Clock()
 
     # Create players with armies
     player1 = Player("Player 1", PlayerType.HUMAN, parse_army_list("army_lists/warhammer_app_dump.txt", waha_helper))
@@ -40,11 +47,11 @@ def initialize_game() -> Tuple[pygame.Surface, WarhammerEnv, Game, Map, float, i
     zoom_level = 1.0
     offset_x, offset_y = ROSTER_PANE_WIDTH, 0  # Adjust initial offset to account for left pane
 
-    return screen, env, game, game_map, zoom_level, offset_x, offset_y, player1, player2
+    return screen, env, game, game_map, zoom_level, offset_x, offset_y, player1, player2, clock
 
 
 def main_game_loop() -> None:
-    screen, env, game, game_map, _, _, _, player1, player2 = initialize_game()
+    screen, env, game, game_map, _, _, _, player1, player2, clock = initialize_game()
     game_view = GameView(screen, env, game, game_map, player1, player2)
     game_state = GameState.SETUP
     clicked_unit = None
@@ -57,7 +64,7 @@ def main_game_loop() -> None:
     tactical_agent_player2 = TacticalAgent(game, player2)
     low_level_agent_player2 = LowLevelAgent(game, player2)
 
-    print("Starting main game loop")
+    logger.debug("Starting main game loop")
 
     running = True
     while running:
@@ -65,7 +72,7 @@ def main_game_loop() -> None:
             while not game.is_game_over():
                 if game.get_current_player() == player1:
                     objective, command = high_level_agent_player1.choose_objective_and_command(game_state=game)
-                    print(f"{player1.name} chose Objective: {objective.name}, Command: {command}")
+                    logger.debug("%s chose Objective: %s, Command: %s", player1.name, objective.name, command)
                     if game.is_command_phase():
                         turn_started = True
                         tactical_agent_player1.command_phase(command)
@@ -90,7 +97,7 @@ def main_game_loop() -> None:
                         turn_started = False
                 else:
                     objective, command = high_level_agent_player2.choose_objective_and_command(game_state=game)
-                    print(f"{player2.name} chose Objective: {objective.name}, Command: {command}")
+                    logger.debug("%s chose Objective: %s, Command: %s", player2.name, objective.name, command)
                     if game.is_command_phase():
                         turn_started = True
                         tactical_agent_player2.command_phase(command)
@@ -125,7 +132,7 @@ def main_game_loop() -> None:
                         if game.get_current_player().has_unit(clicked_unit):
                             game_view.selected_unit = clicked_unit
                         else:
-                            print("Unit not found in current player's army")
+                            logger.debug("Unit not found in current player's army")
 
                         if game_view.selected_unit:
                             if game.is_movement_phase():
@@ -142,9 +149,9 @@ def main_game_loop() -> None:
                         clicked_unit = game_view.get_unit_at_position(*event.pos)
                         if clicked_unit:
                             game_view.info_pane.selected_unit = clicked_unit
-                            print(f"Selected unit: {clicked_unit.name}")
+                            logger.debug("Selected unit: %s", clicked_unit.name)
                         else:
-                            print("No unit at this position")
+                            logger.debug("No unit at this position")
                 else:
                     game_view.on_mouse_press(*event.pos, event.button)
             elif event.type == pygame.MOUSEWHEEL:
@@ -152,17 +159,18 @@ def main_game_loop() -> None:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE and game_state == GameState.SETUP:
                     game_state = GameState.PLAYING
-                    print("Game started!")
+                    logger.debug("Game started!")
                 elif event.key == pygame.K_SPACE and game_state == GameState.PLAYING:
                     game.next_turn()
                 elif event.key == pygame.K_a and game_state == GameState.PLAYING:
                     game.do_ai_action = True
 
+        # Sample the held keys once per frame; polling can't get stuck the way KEYUP tracking does on focus loss
         keys_pressed = pygame.key.get_pressed()
         game_view.offset_x, game_view.offset_y = handle_pan(keys_pressed, game_view.offset_x, game_view.offset_y, game_view.zoom_level)
 
-        game_view.draw()
-        pygame.display.flip()
+        game_view.draw()  # Also presents the frame
+        clock.tick(FPS)
 
     pygame.quit()
     sys.exit()
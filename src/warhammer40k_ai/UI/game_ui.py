@@ -1,13 +1,18 @@
+import logging
 import pygame
 import textwrap
 import math
-from typing import Optional, Tuple, Dict
+import numpy as np
+from functools import lru_cache
+from typing import Optional, Tuple, Dict, List
 from warhammer40k_ai.classes.unit import Unit
 from warhammer40k_ai.utility.model_base import Base, BaseType
 from warhammer40k_ai.classes.player import Player
 from warhammer40k_ai.classes.game import Game
 from warhammer40k_ai.classes.map import Obstacle, ObstacleType
 
+logger = logging.getLogger(__name__)
+
 # Constants
 TILE_SIZE = 20  # 20 pixels per inch
 BATTLEFIELD_WIDTH_INCHES = 60
@@ -22,6 +27,7 @@ GREY = (50, 50, 50)
 GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 RED = (255, 0, 0)
+_PLAYER_COLORS = {1: GREEN, 2: RED}
 
 # Game states
 class GameState:
@@ -42,6 +48,43 @@ ROSTER_FONT_SIZE = 18
 ROSTER_LINE_HEIGHT = 20
 INFO_PANE_HEIGHT = 100
 
+# Hover info text rendering, cached since the same few strings are drawn every frame
+_FONT = None
+_text_cache: Dict[Tuple[str, int], pygame.Surface] = {}
+_background_cache: Dict[Tuple[int, int], pygame.Surface] = {}
+
+def _get_font() -> pygame.font.Font:
+    # Created lazily as fonts need pygame to be initialised first
+    global _FONT
+    if _FONT is None:
+        _FONT = pygame.font.SysFont(None, 24)
+    return _FONT
+
+def _get_unit_info_text(unit_name: str, num_models: int) -> pygame.Surface:
+    key = (unit_name, num_models)
+    text_surface = _text_cache.get(key)
+    if text_surface is None:
+        text_surface = _get_font().render(f"{unit_name} - {num_models} models", True, (255, 255, 255))  # White text
+        if pygame.display.get_surface() is not None:
+            text_surface = text_surface.convert_alpha()
+        _text_cache[key] = text_surface
+    return text_surface
+
+def _get_info_background(size: Tuple[int, int]) -> pygame.Surface:
+    background = _background_cache.get(size)
+    if background is None:
+        background = pygame.Surface(size, pygame.SRCALPHA)
+        background.fill((0, 0, 0, 180))  # Semi-transparent black
+        if pygame.display.get_surface() is not None:
+            background = background.convert_alpha()
+        _background_cache[size] = background
+    return background
+
+@lru_cache(maxsize=512)
+def _wrap_unit_name(name: str) -> Tuple[str, ...]:
+    # Unit names are wrapped the same way wherever they're drawn, and many units share a name
+    return tuple(textwrap.wrap(name, width=20))
+
 # Add these new classes
 class RosterPane(pygame.sprite.Sprite):
     def __init__(self, left, bottom, width, height, roster):
@@ -66,30 +109,44 @@ class RosterPane(pygame.sprite.Sprite):
                 self.button_height
             )
             self.buttons.append((button_rect, unit))
+        # Rosters don't change during play, so compose each button (background and wrapped name) once
+        self._button_blits = [self._compose_button(button_rect, unit) for button_rect, unit in self.buttons]
+
+    def _compose_button(self, button_rect: pygame.Rect, unit: Unit) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        # Returns the composed button surface and where to blit it; long names may overflow the button
+        texts = []
+        for i, line in enumerate(_wrap_unit_name(unit.name)):
+            text = self.font.render(line, True, pygame.Color('black'))
+            texts.append((text, text.get_rect(center=(button_rect.centerx, button_rect.top + 15 + i * 20))))
+        area = button_rect.unionall([text_rect for _, text_rect in texts]) if texts else button_rect.copy()
+
+        composed = pygame.Surface(area.size, pygame.SRCALPHA)
+        pygame.draw.rect(composed, pygame.Color('white'), button_rect.move(-area.left, -area.top), border_radius=5)
+        composed.blits([(text, text_rect.move(-area.left, -area.top)) for text, text_rect in texts], doreturn=False)
+        if pygame.display.get_surface() is not None:
+            composed = composed.convert_alpha()
+        return composed, area.topleft
+
+    def _button_at(self, x, y) -> Optional[Unit]:
+        # Buttons are stacked at a constant pitch, so the only candidate can be computed from y directly
+        index = (y - self.rect.top - 10) // (self.button_height + 5)
+        if 0 <= index < len(self.buttons):
+            button_rect, unit = self.buttons[index]
+            if button_rect.collidepoint(x, y):
+                return unit
+        return None
 
     def on_mouse_press(self, x, y, button):
         if button == 1:  # Left mouse button
-            for button_rect, unit in self.buttons:
-                if button_rect.collidepoint(x, y):
-                    self.selected_unit = unit
-                    return
-            self.selected_unit = None
+            self.selected_unit = self._button_at(x, y)
             
             # Remove the elif block here, as it's redundant with GameView.on_mouse_press
 
     def draw(self, surface):
         pygame.draw.rect(surface, self.background_color, self.rect)
         
-        for button_rect, unit in self.buttons:
-            # Draw button background
-            pygame.draw.rect(surface, pygame.Color('white'), button_rect, border_radius=5)
-            
-            # Draw unit name (wrapped)
-            wrapped_text = textwrap.wrap(unit.name, width=20)
-            for i, line in enumerate(wrapped_text):
-                text = self.font.render(line, True, pygame.Color('black'))
-                text_rect = text.get_rect(center=(button_rect.centerx, button_rect.top + 15 + i * 20))
-                surface.blit(text, text_rect)
+        # Draw the pre-composed buttons (background and wrapped unit name)
+        surface.blits(self._button_blits, doreturn=False)
 
         # Highlight the selected unit
         if self.selected_unit:
@@ -99,10 +156,7 @@ class RosterPane(pygame.sprite.Sprite):
                     break
 
     def get_hovered_unit(self, x, y):
-        for button_rect, unit in self.buttons:
-            if button_rect.collidepoint(x, y):
-                return unit
-        return None
+        return self._button_at(x, y)
 
 
 class InfoPane(pygame.sprite.Sprite):
@@ -154,6 +208,27 @@ class GameView:
         # Create InfoPane
         self.info_pane = InfoPane(ROSTER_PANE_WIDTH, BATTLEFIELD_HEIGHT, BATTLEFIELD_WIDTH, INFO_PANE_HEIGHT, self.selected_unit)
 
+        # Spatial hash of deployed unit positions for hover tests, rebuilt when Unit.state_version shows a unit
+        # moved or lost models, or a unit was placed
+        self._hover_grid: Dict[Tuple[int, int], list] = {}
+        self._hover_cell_size = 1.0
+        self._hover_grid_version = None
+
+        # Owning player (1 or 2) of each unit by id(unit), rebuilt when an army changes (see _unit_owner)
+        self._unit_owners: Dict[int, int] = {}
+        self._unit_owners_key = None
+
+        # Dirty-rect redraw state: the scene without hover overlays, the view it was drawn for and the
+        # overlay rects and mouse position of the previous frame (see draw)
+        self._scene = None
+        self._last_view_key = None
+        self._last_overlay_rects = []
+        self._last_mouse_pos = None
+
+        # Battlefield render target, reused by every redraw (draw_battlefield clears it) and created in the
+        # screen's pixel format so blitting it onto the screen is a plain copy
+        self._battlefield_surface = pygame.Surface((BATTLEFIELD_WIDTH, BATTLEFIELD_HEIGHT), 0, screen)
+
     def on_mouse_press(self, x, y, button):
         if button == 1:  # Left mouse button
             # Check if click is in player1's roster pane
@@ -184,13 +259,13 @@ class GameView:
                     self.selected_unit.set_position(unit_x, unit_y)
                     
                     if self.game_map.place_unit(self.selected_unit):
-                        print(f"Unit {self.selected_unit.name} placed with centroid at ({unit_x}, {unit_y})")
+                        logger.debug("Unit %s placed with centroid at (%s, %s)", self.selected_unit.name, unit_x, unit_y)
                         self.selected_unit.deployed = True
                     else:
-                        print("Failed to place unit")
+                        logger.debug("Failed to place unit")
                         self.reset_unit_position(self.selected_unit, original_unit_position, original_model_positions)
                 else:
-                    print("Unable to place all models in the unit")
+                    logger.debug("Unable to place all models in the unit")
                     self.reset_unit_position(self.selected_unit, original_unit_position, original_model_positions)
                 
                 self.selected_unit = None
@@ -220,31 +295,58 @@ class GameView:
             battlefield_x = (x - ROSTER_PANE_WIDTH) / TILE_SIZE / self.zoom_level - self.offset_x / TILE_SIZE
             battlefield_y = y / TILE_SIZE / self.zoom_level - self.offset_y / TILE_SIZE
             
-            for unit in self.game_map.units:
+            for unit in self._units_near(battlefield_x, battlefield_y):
                 if unit.is_point_inside(battlefield_x, battlefield_y):
                     # Determine which roster the unit belongs to
-                    if unit in self.player1.get_army().units:
+                    owner = self._unit_owner(unit)
+                    if owner == 1:
                         return unit, self.player1_roster
-                    elif unit in self.player2.get_army().units:
+                    elif owner == 2:
                         return unit, self.player2_roster
         
         return None, None
 
+    def _units_near(self, x: float, y: float) -> list:
+        """Return the map units whose hover area could contain (x, y), in map order."""
+        version = (Unit.state_version, len(self.game_map.units))
+        if version != self._hover_grid_version:
+            # Cells are as wide as the largest hover radius, so a hit is always in the 3x3 block around the point
+            self._hover_cell_size = max((unit.coherency_distance for unit in self.game_map.units), default=1.0)
+            self._hover_grid = {}
+            for index, unit in enumerate(self.game_map.units):
+                position = unit.get_position()
+                if position is None:
+                    continue
+                cell = (int(position[0] // self._hover_cell_size), int(position[1] // self._hover_cell_size))
+                self._hover_grid.setdefault(cell, []).append((index, unit))
+            self._hover_grid_version = version
+
+        cx, cy = int(x // self._hover_cell_size), int(y // self._hover_cell_size)
+        nearby = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nearby.extend(self._hover_grid.get((cx + dx, cy + dy), ()))
+        if len(nearby) > 1:
+            nearby.sort(key=lambda entry: entry[0])
+        return [unit for _, unit in nearby]
+
     def get_unit_at_position(self, x: float, y: float) -> Optional[Unit]:
         # Convert screen coordinates to game coordinates
         game_x = (x - ROSTER_PANE_WIDTH - self.offset_x) / (TILE_SIZE * self.zoom_level)
         game_y = (y - self.offset_y) / (TILE_SIZE * self.zoom_level)
         
-        print(f"Checking for unit at game coordinates: ({game_x}, {game_y})")
+        logger.debug("Checking for unit at game coordinates: (%s, %s)", game_x, game_y)
 
         for player in [self.player1, self.player2]:
-            for unit in [unit for unit in player.get_army().units if unit.deployed]:
-                print(f"Checking unit: {unit.name}")
-                print(f"Unit position: {unit.get_position()}")
+            for unit in player.get_army().units:
+                if not unit.deployed:
+                    continue
+                logger.debug("Checking unit: %s", unit.name)
+                logger.debug("Unit position: %s", unit.get_position())
                 if unit.is_point_inside(game_x, game_y):
                     return unit
         
-        print("No unit found at position")
+        logger.debug("No unit found at position")
         return None
 
     def draw_move_path(self, unit: Unit):
@@ -272,11 +374,48 @@ class GameView:
 
     def game_to_screen_coords(self, x: float, y: float) -> Tuple[int, int]:
         # Convert game coordinates to screen coordinates
-        screen_x = int(ROSTER_PANE_WIDTH + (x * TILE_SIZE * self.zoom_level) + self.offset_x)
-        screen_y = int(y * TILE_SIZE * self.zoom_level + self.offset_y)
+        scale = TILE_SIZE * self.zoom_level
+        screen_x = int(ROSTER_PANE_WIDTH + (x * scale) + self.offset_x)
+        screen_y = int(y * scale + self.offset_y)
         return (screen_x, screen_y)
 
     def draw(self):
+        # Sample the mouse once per frame
+        mouse_pos = pygame.mouse.get_pos()
+
+        view_key = self._view_key()
+        full_update = view_key != self._last_view_key or self._scene is None
+        if not full_update and mouse_pos == self._last_mouse_pos:
+            return  # Neither the scene nor the hover overlays can have changed since the last frame
+        if full_update:
+            self._draw_scene()
+            self._scene = self.screen.copy()
+        else:
+            # Nothing but the hover overlays can have changed: restore what they covered last frame
+            for rect in self._last_overlay_rects:
+                self.screen.blit(self._scene, rect, rect)
+
+        overlay_rects = self._draw_overlays(mouse_pos)
+
+        if full_update:
+            pygame.display.update()
+        else:
+            pygame.display.update(self._last_overlay_rects + overlay_rects)
+        self._last_view_key = view_key
+        self._last_overlay_rects = overlay_rects
+        self._last_mouse_pos = mouse_pos
+
+    def _view_key(self) -> tuple:
+        """Snapshot of everything the scene (all but the hover overlays) is drawn from."""
+        return (self.zoom_level, self.offset_x, self.offset_y,
+                self.selected_unit, self.info_pane.selected_unit,
+                self.player1_roster.selected_unit, self.player2_roster.selected_unit,
+                self.game.turn, self.game.phase, self.game.get_current_player(), len(self.game_map.obstacles),
+                # Any model moving, turning or taking damage, status effects changing a unit's stats,
+                # and any unit being placed
+                Unit.state_version, len(self.game_map.units))
+
+    def _draw_scene(self):
         self.screen.fill(WHITE)
     
         # Draw debug rectangles for roster panes
@@ -288,16 +427,16 @@ class GameView:
         self.player2_roster.draw(self.screen)
 
         # Draw the battlefield
-        battlefield_surface = pygame.Surface((BATTLEFIELD_WIDTH, BATTLEFIELD_HEIGHT))
+        battlefield_surface = self._battlefield_surface
         draw_battlefield(battlefield_surface, self.zoom_level, self.offset_x, self.offset_y)
 
         # Draw obstacles on the battlefield
         for obstacle in self.game_map.obstacles:
             draw_obstacle(battlefield_surface, obstacle, self.zoom_level, self.offset_x, self.offset_y)
 
-        # Draw units on the battlefield
+        # Draw units on the battlefield (their hover highlights are overlays)
         for unit in self.game_map.units:
-            draw_units(battlefield_surface, unit, self.zoom_level, self.offset_x, self.offset_y, pygame.mouse.get_pos(), self.player1, self.player2)
+            draw_units(battlefield_surface, unit, self.zoom_level, self.offset_x, self.offset_y, None, self._unit_color(unit))
         
         self.screen.blit(battlefield_surface, (ROSTER_PANE_WIDTH, 0))
 
@@ -307,22 +446,41 @@ class GameView:
         # Draw actual InfoPane content
         self.info_pane.draw(self.screen, self.game)
 
-        # Display unit info for hovered unit
-        mouse_pos = pygame.mouse.get_pos()
-        hovered_unit, roster_pane = self.get_hovered_unit(*mouse_pos)
-        if hovered_unit:
-            self.display_unit_info(hovered_unit, roster_pane)
-
         # Draw move paths for all units
         for unit in self.game.get_current_player().get_army().units:
             self.draw_move_path(unit)
 
-        pygame.display.update()
+    def _draw_overlays(self, mouse_pos: Tuple[int, int]) -> List[pygame.Rect]:
+        """Draw the mouse dependent unit highlights and hover info, returning the screen rects they cover."""
+        overlay_rects = []
+        battlefield = self.screen.subsurface((ROSTER_PANE_WIDTH, 0, BATTLEFIELD_WIDTH, BATTLEFIELD_HEIGHT))
+        for unit in self.game_map.units:
+            highlight_rect = draw_unit_bounding_box(battlefield, unit, self.zoom_level, self.offset_x, self.offset_y, mouse_pos)
+            if highlight_rect:
+                overlay_rects.append(highlight_rect.move(ROSTER_PANE_WIDTH, 0))
+
+        # Display unit info for hovered unit
+        hovered_unit, roster_pane = self.get_hovered_unit(*mouse_pos)
+        if hovered_unit:
+            overlay_rects.append(self.display_unit_info(hovered_unit, roster_pane))
+        return overlay_rects
+
+    def _unit_owner(self, unit: Unit) -> Optional[int]:
+        """Return 1 or 2 for a unit in player 1's or player 2's army, None otherwise."""
+        units1, units2 = self.player1.get_army().units, self.player2.get_army().units
+        key = (id(units1), len(units1), id(units2), len(units2))
+        if key != self._unit_owners_key:
+            self._unit_owners = {id(army_unit): 2 for army_unit in units2}
+            self._unit_owners.update({id(army_unit): 1 for army_unit in units1})
+            self._unit_owners_key = key
+        return self._unit_owners.get(id(unit))
+
+    def _unit_color(self, unit: Unit) -> Tuple[int, int, int]:
+        """Return the color a unit is drawn in: green for player 1, red for player 2, blue otherwise."""
+        return _PLAYER_COLORS.get(self._unit_owner(unit), BLUE)
 
     def display_unit_info(self, unit, roster_pane):
-        font = pygame.font.SysFont(None, 24)
-        info_text = f"{unit.name} - {len(unit.models)} models"
-        text_surface = font.render(info_text, True, (255, 255, 255))  # White text
+        text_surface = _get_unit_info_text(unit.name, len(unit.models))
         text_rect = text_surface.get_rect()
         
         # Find the button for this unit in the roster pane
@@ -345,43 +503,55 @@ class GameView:
         
         # Draw a semi-transparent background
         background_rect = text_rect.inflate(20, 10)
-        background = pygame.Surface(background_rect.size, pygame.SRCALPHA)
-        background.fill((0, 0, 0, 180))  # Semi-transparent black
-        self.screen.blit(background, background_rect.topleft)
+        self.screen.blit(_get_info_background(background_rect.size), background_rect.topleft)
         
         # Draw the text
         self.screen.blit(text_surface, text_rect)
+        return background_rect
 
 
 ### Battlefield drawing functions
+# Pre-rendered grid surface for the current tile size in pixels (i.e. zoom level); a full-battlefield
+# surface is tens of MB when zoomed in, so only the one in use is kept
+_grid_cache: Dict[int, pygame.Surface] = {}
+
+def _get_grid_surface(tile_size: int) -> pygame.Surface:
+    grid = _grid_cache.get(tile_size)
+    if grid is None:
+        _grid_cache.clear()
+        width = BATTLEFIELD_WIDTH_INCHES * tile_size + 1
+        height = BATTLEFIELD_HEIGHT_INCHES * tile_size + 1
+        grid = pygame.Surface((width, height))
+        grid.fill(WHITE)
+        # Draw every grid line as a single zig-zag polyline: the joining segments run along the outermost
+        # grid lines, so the result matches drawing each line separately
+        bottom, right = height - 1, width - 1
+        points = []
+        for x in range(BATTLEFIELD_WIDTH_INCHES + 1):
+            ends = ((x * tile_size, 0), (x * tile_size, bottom))
+            points.extend(ends if x % 2 == 0 else ends[::-1])
+        # Continue with the horizontal lines from the corner the vertical pass ended in
+        rows = range(BATTLEFIELD_HEIGHT_INCHES + 1)
+        if points[-1][1] == bottom:
+            rows = reversed(rows)
+        for i, y in enumerate(rows):
+            ends = ((right, y * tile_size), (0, y * tile_size))
+            points.extend(ends if i % 2 == 0 else ends[::-1])
+        pygame.draw.lines(grid, GREY, False, points)
+        if pygame.display.get_surface() is not None:
+            grid = grid.convert()  # Match the display format so the per-frame blit needs no conversion
+        _grid_cache[tile_size] = grid
+    return grid
+
 def draw_battlefield(screen: pygame.Surface, zoom_level: float, offset_x: int, offset_y: int) -> None:
     screen.fill(WHITE)
     tile_size = int(TILE_SIZE * zoom_level)
-    
-    # Calculate the visible area
-    visible_width = BATTLEFIELD_WIDTH
-    visible_height = BATTLEFIELD_HEIGHT
-    
-    # Calculate the range of tiles to draw
-    start_x = max(0, int(-offset_x / tile_size))
-    end_x = min(BATTLEFIELD_WIDTH_INCHES, int((visible_width - offset_x) / tile_size) + 1)
-    start_y = max(0, int(-offset_y / tile_size))
-    end_y = min(BATTLEFIELD_HEIGHT_INCHES, int((visible_height - offset_y) / tile_size) + 1)
-    
-    # Draw vertical lines
-    for x in range(start_x, end_x + 1):
-        screen_x = int(x * tile_size + offset_x)
-        if 0 <= screen_x < visible_width:
-            pygame.draw.line(screen, GREY, (screen_x, 0), (screen_x, visible_height))
-    
-    # Draw horizontal lines
-    for y in range(start_y, end_y + 1):
-        screen_y = int(y * tile_size + offset_y)
-        if 0 <= screen_y < visible_height:
-            pygame.draw.line(screen, GREY, (0, screen_y), (visible_width, screen_y))
-    
+
+    # The grid only changes with zoom, so blit the cached rendering instead of redrawing every line
+    screen.blit(_get_grid_surface(tile_size), (int(offset_x), int(offset_y)))
+
     # Draw battlefield border
-    pygame.draw.rect(screen, RED, (0, 0, visible_width, visible_height), 2)
+    pygame.draw.rect(screen, RED, (0, 0, BATTLEFIELD_WIDTH, BATTLEFIELD_HEIGHT), 2)
 
 def draw_obstacle(screen: pygame.Surface, obstacle: Obstacle, zoom_level: float, offset_x: int, offset_y: int) -> None:
     # Determine the color based on the obstacle type
@@ -398,12 +568,9 @@ def draw_obstacle(screen: pygame.Surface, obstacle: Obstacle, zoom_level: float,
     else:
         color = (255, 255, 255, 180)  # Default white
 
-    # Convert vertices to screen coordinates
-    screen_vertices = [
-        (int((vertex[0] * TILE_SIZE) * zoom_level + offset_x),
-         int((vertex[1] * TILE_SIZE) * zoom_level + offset_y))
-        for vertex in obstacle.vertices
-    ]
+    # Convert vertices to screen coordinates, as one affine transform over all of them
+    scale = TILE_SIZE * zoom_level
+    screen_vertices = (np.asarray(obstacle.vertices, dtype=float) * scale + (offset_x, offset_y)).astype(np.int32).tolist()
 
     # Draw the filled polygon
     pygame.draw.polygon(screen, color, screen_vertices)
@@ -411,133 +578,157 @@ def draw_obstacle(screen: pygame.Surface, obstacle: Obstacle, zoom_level: float,
     # Draw the outline of the polygon
     pygame.draw.polygon(screen, (0, 0, 0), screen_vertices, 2)  # Black outline with 2px width
 
-def draw_units(screen: pygame.Surface, unit: Unit, zoom_level: float, offset_x: int, offset_y: int, mouse_pos: Tuple[int, int], player1: Player, player2: Player) -> None:
-    # Determine the color based on which player the unit belongs to
-    color = GREEN if unit in player1.get_army().units else RED if unit in player2.get_army().units else BLUE
-
-    for model in unit.models:
-        x, y = model.get_location()[:2]
-        screen_x = int((x * TILE_SIZE) * zoom_level + offset_x)
-        screen_y = int((y * TILE_SIZE) * zoom_level + offset_y)
+# Base sizes in pixels at the current scale, keyed by base shape; models of a unit share a base size
+_base_pixel_cache: Dict[Tuple[BaseType, Tuple[float, float]], Tuple[int, int, int, int]] = {}
+# Pre-rendered base stamps at the current scale, keyed by base shape, color (and facing for non-circular bases)
+_base_stamp_cache: Dict[tuple, pygame.Surface] = {}
+_BASE_STAMP_CACHE_SIZE = 256  # Facings vary freely, so bound the number of rotated stamps kept
+_base_pixel_scale = None
+
+def _check_base_scale(scale: float) -> None:
+    # Both base caches only hold entries for one scale (i.e. zoom level) at a time
+    global _base_pixel_scale
+    if scale != _base_pixel_scale:
+        _base_pixel_cache.clear()
+        _base_stamp_cache.clear()
+        _base_pixel_scale = scale
+
+def _get_base_pixels(base: Base, scale: float) -> Tuple[int, int, int, int]:
+    """
+    Return (radius, width, height, longest distance) of the base in pixels at the given scale.
+    The cache is dropped whenever the scale (i.e. zoom level) changes.
+    """
+    _check_base_scale(scale)
+    key = (base.base_type, base.radius)
+    pixels = _base_pixel_cache.get(key)
+    if pixels is None:
+        radius = int(base.getRadius() * scale) if base.base_type == BaseType.CIRCULAR else 0
+        pixels = (radius,
+                  int(base.radius[0] * 2 * scale),
+                  int(base.radius[1] * 2 * scale),
+                  int(base.longestDistance() * scale))
+        _base_pixel_cache[key] = pixels
+    return pixels
+
+def _get_base_stamp(base: Base, scale: float, color: Tuple[int, int, int]) -> pygame.Surface:
+    """
+    Return the base rendered (outer shape in the player color, white inner shape) onto a transparent surface,
+    centred on the base. Non-circular bases are rendered already rotated to their facing.
+    """
+    pixels = _get_base_pixels(base, scale)
+    circular = base.base_type == BaseType.CIRCULAR
+    key = (base.base_type, base.radius, color) if circular else (base.base_type, base.radius, color, base.facing)
+    stamp = _base_stamp_cache.get(key)
+    if stamp is None:
+        stamp = _BASE_STAMP_RENDERERS[base.base_type](base, pixels, color)
+        if pygame.display.get_surface() is not None:
+            stamp = stamp.convert_alpha()
+        if len(_base_stamp_cache) >= _BASE_STAMP_CACHE_SIZE:
+            _base_stamp_cache.clear()
+        _base_stamp_cache[key] = stamp
+    return stamp
+
+def _render_circular_stamp(base: Base, pixels: Tuple[int, int, int, int], color: Tuple[int, int, int]) -> pygame.Surface:
+    radius = pixels[0]
+    stamp = pygame.Surface((2 * radius + 1, 2 * radius + 1), pygame.SRCALPHA)
+    pygame.draw.circle(stamp, color, (radius, radius), radius)
+    pygame.draw.circle(stamp, (255, 255, 255), (radius, radius), max(1, int(radius * 0.8)))
+    return stamp
+
+def _render_rotated_stamp(draw_shape, base: Base, pixels: Tuple[int, int, int, int], color: Tuple[int, int, int]) -> pygame.Surface:
+    _, width, height, _ = pixels
+    shape = pygame.Surface((width, height), pygame.SRCALPHA)
+    shape.fill((0, 0, 0, 0))  # Transparent background
+    draw_shape(shape, color, (0, 0, width, height))
+    inner_width, inner_height = max(1, int(width * 0.8)), max(1, int(height * 0.8))
+    inner_rect = pygame.Rect((width - inner_width) // 2, (height - inner_height) // 2, inner_width, inner_height)
+    draw_shape(shape, (255, 255, 255), inner_rect)
+    return pygame.transform.rotate(shape, -math.degrees(base.facing))
+
+def _render_elliptical_stamp(base: Base, pixels: Tuple[int, int, int, int], color: Tuple[int, int, int]) -> pygame.Surface:
+    return _render_rotated_stamp(pygame.draw.ellipse, base, pixels, color)
+
+def _render_hull_stamp(base: Base, pixels: Tuple[int, int, int, int], color: Tuple[int, int, int]) -> pygame.Surface:
+    return _render_rotated_stamp(pygame.draw.rect, base, pixels, color)
+
+# Stamp rendering function per base type, see _get_base_stamp; base types missing here are not drawn
+_BASE_STAMP_RENDERERS = {
+    BaseType.CIRCULAR: _render_circular_stamp,
+    BaseType.ELLIPTICAL: _render_elliptical_stamp,
+    BaseType.HULL: _render_hull_stamp,
+}
+
+def draw_units(screen: pygame.Surface, unit: Unit, zoom_level: float, offset_x: int, offset_y: int, mouse_pos: Optional[Tuple[int, int]], color: Tuple[int, int, int]) -> Optional[pygame.Rect]:
+    """Draw the unit's models; if mouse_pos is given also its hover highlight, returning the highlighted rect."""
+    scale = TILE_SIZE * zoom_level
+
+    # Skip the models of units entirely outside the view; all models of a unit share the first model's base
+    bounding_box = unit.get_bounding_box()
+    if bounding_box is not None:
+        min_x, min_y, max_x, max_y = bounding_box
+        pad = _get_base_pixels(unit.models[0].model_base, scale)[3] + 2
+        unit_rect = pygame.Rect(int(min_x * scale + offset_x) - pad, int(min_y * scale + offset_y) - pad,
+                                int((max_x - min_x) * scale) + 2 * pad + 1, int((max_y - min_y) * scale) + 2 * pad + 1)
+        if not screen.get_rect().colliderect(unit_rect):
+            return draw_unit_bounding_box(screen, unit, zoom_level, offset_x, offset_y, mouse_pos) if mouse_pos is not None else None
+
+    # World -> screen transform for the whole unit in one go
+    screen_coords = (unit.get_positions_array() * scale + (offset_x, offset_y)).astype(np.int32)
+
+    # Collect the base stamps and facing lines first so all bases go out in a single blits() call
+    stamps = []
+    facing_lines = []
+    for model, (screen_x, screen_y) in zip(unit.models, screen_coords.tolist()):
         base = model.model_base
-        
-        draw_base(screen, base, screen_x, screen_y, zoom_level, color)
+        if base.base_type not in _BASE_STAMP_RENDERERS:
+            continue  # Skip if base type is unknown
+        stamp = _get_base_stamp(base, scale, color)
+        stamps.append((stamp, (screen_x - stamp.get_width() // 2, screen_y - stamp.get_height() // 2)))
         
         # Draw facing direction
+        radius, width, height, longest = _get_base_pixels(base, scale)
+        cos_facing, sin_facing = math.cos(base.facing), math.sin(base.facing)
         if base.base_type == BaseType.CIRCULAR:
-            radius = int(base.getRadius() * TILE_SIZE * zoom_level)
-            end_x = screen_x + int(radius * math.cos(base.facing))
-            end_y = screen_y + int(radius * math.sin(base.facing))
-        elif base.base_type in [BaseType.ELLIPTICAL, BaseType.HULL]:
-            width = int(base.longestDistance() * TILE_SIZE * zoom_level)
-            height = int(base.longestDistance() * TILE_SIZE * zoom_level)
-            end_x = screen_x + int(width * math.cos(base.facing))
-            end_y = screen_y + int(height * math.sin(base.facing))
+            end_x = screen_x + int(radius * cos_facing)
+            end_y = screen_y + int(radius * sin_facing)
         else:
-            continue  # Skip if base type is unknown
-        
-        pygame.draw.line(screen, BLACK, (screen_x, screen_y), (end_x, end_y), 2)
+            # Facing line drawn with the rotated base, then the one out to the furthest point of the base
+            facing_line_length = max(width, height) // 2
+            facing_lines.append(((screen_x, screen_y), (screen_x + int(facing_line_length * cos_facing),
+                                                        screen_y + int(facing_line_length * sin_facing))))
+            end_x = screen_x + int(longest * cos_facing)
+            end_y = screen_y + int(longest * sin_facing)
+        facing_lines.append(((screen_x, screen_y), (end_x, end_y)))
+
+    screen.blits(stamps, doreturn=False)
+    for start, end in facing_lines:
+        pygame.draw.line(screen, BLACK, start, end, 2)
     
     # Calculate and draw unit bounding box
-    draw_unit_bounding_box(screen, unit, zoom_level, offset_x, offset_y, mouse_pos)
-
-def draw_base(screen: pygame.Surface, base: Base, screen_x: int, screen_y: int, zoom_level: float, color: Tuple[int, int, int]) -> None:
-    if base.base_type == BaseType.CIRCULAR:
-        draw_circular_base(screen, base, screen_x, screen_y, zoom_level, color)
-    elif base.base_type == BaseType.ELLIPTICAL:
-        draw_elliptical_base(screen, base, screen_x, screen_y, zoom_level, color)
-    elif base.base_type == BaseType.HULL:
-        draw_hull_base(screen, base, screen_x, screen_y, zoom_level, color)
-
-def draw_circular_base(screen: pygame.Surface, base: Base, screen_x: int, screen_y: int, zoom_level: float, color: Tuple[int, int, int]) -> None:
-    radius = int(base.getRadius() * TILE_SIZE * zoom_level)
-    pygame.draw.circle(screen, color, (screen_x, screen_y), radius)
-    inner_radius = max(1, int(radius * 0.8))
-    pygame.draw.circle(screen, (255, 255, 255), (screen_x, screen_y), inner_radius)
-
-def draw_elliptical_base(screen: pygame.Surface, base: Base, screen_x: int, screen_y: int, zoom_level: float, color: Tuple[int, int, int]) -> None:
-    width = int(base.radius[0] * 2 * TILE_SIZE * zoom_level)
-    height = int(base.radius[1] * 2 * TILE_SIZE * zoom_level)
-    
-    # Create a surface for the ellipse
-    ellipse_surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    ellipse_surface.fill((0, 0, 0, 0))  # Transparent background
-    
-    # Draw the outer ellipse
-    pygame.draw.ellipse(ellipse_surface, color, (0, 0, width, height))
-    
-    # Draw the inner ellipse
-    inner_width, inner_height = max(1, int(width * 0.8)), max(1, int(height * 0.8))
-    inner_rect = pygame.Rect((width - inner_width) // 2, (height - inner_height) // 2, inner_width, inner_height)
-    pygame.draw.ellipse(ellipse_surface, (255, 255, 255), inner_rect)
-    
-    # Rotate the surface
-    angle_degrees = math.degrees(base.facing)
-    rotated_surface = pygame.transform.rotate(ellipse_surface, -angle_degrees)
-    
-    # Calculate the position to blit the rotated surface
-    blit_pos = (screen_x - rotated_surface.get_width() // 2, 
-                screen_y - rotated_surface.get_height() // 2)
-    
-    # Blit the rotated surface onto the screen
-    screen.blit(rotated_surface, blit_pos)
-    
-    # Draw the facing line on the screen after rotation
-    facing_line_length = max(width, height) // 2
-    end_x = screen_x + int(facing_line_length * math.cos(base.facing))
-    end_y = screen_y + int(facing_line_length * math.sin(base.facing))
-    pygame.draw.line(screen, (0, 0, 0), (screen_x, screen_y), (end_x, end_y), 2)
-
-def draw_hull_base(screen: pygame.Surface, base: Base, screen_x: int, screen_y: int, zoom_level: float, color: Tuple[int, int, int]) -> None:
-    width = int(base.radius[0] * 2 * TILE_SIZE * zoom_level)
-    height = int(base.radius[1] * 2 * TILE_SIZE * zoom_level)
-    
-    # Create a surface for the hull
-    hull_surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    hull_surface.fill((0, 0, 0, 0))  # Transparent background
-    
-    # Draw the outer hull
-    pygame.draw.rect(hull_surface, color, (0, 0, width, height))
-    
-    # Draw the inner hull
-    inner_width, inner_height = max(1, int(width * 0.8)), max(1, int(height * 0.8))
-    inner_rect = pygame.Rect((width - inner_width) // 2, (height - inner_height) // 2, inner_width, inner_height)
-    pygame.draw.rect(hull_surface, (255, 255, 255), inner_rect)
-    
-    # Rotate the surface
-    angle_degrees = math.degrees(base.facing)
-    rotated_surface = pygame.transform.rotate(hull_surface, -angle_degrees)
-    
-    # Calculate the position to blit the rotated surface
-    blit_pos = (screen_x - rotated_surface.get_width() // 2, 
-                screen_y - rotated_surface.get_height() // 2)
-    
-    # Blit the rotated surface onto the screen
-    screen.blit(rotated_surface, blit_pos)
-    
-    # Draw the facing line on the screen after rotation
-    facing_line_length = max(width, height) // 2
-    end_x = screen_x + int(facing_line_length * math.cos(base.facing))
-    end_y = screen_y + int(facing_line_length * math.sin(base.facing))
-    pygame.draw.line(screen, (0, 0, 0), (screen_x, screen_y), (end_x, end_y), 2)
+    return draw_unit_bounding_box(screen, unit, zoom_level, offset_x, offset_y, mouse_pos) if mouse_pos is not None else None
 
-def draw_unit_bounding_box(screen: pygame.Surface, unit: Unit, zoom_level: float, offset_x: int, offset_y: int, mouse_pos: Tuple[int, int]) -> None:
+def draw_unit_bounding_box(screen: pygame.Surface, unit: Unit, zoom_level: float, offset_x: int, offset_y: int, mouse_pos: Tuple[int, int]) -> Optional[pygame.Rect]:
+    """Highlight the unit's bounding box if hovered, returning the highlighted rect (or None)."""
     position = unit.get_position()
     if position is None:
-        return
+        return None
 
     center_x, center_y, _ = position
     radius = unit.coherency_distance  # Assuming this is defined in the Unit class
+    scale = TILE_SIZE * zoom_level
+    size = int(2 * radius * scale)
 
     bounding_box_rect = pygame.Rect(
-        int((center_x - radius) * TILE_SIZE * zoom_level + offset_x),
-        int((center_y - radius) * TILE_SIZE * zoom_level + offset_y),
-        int(2 * radius * TILE_SIZE * zoom_level),
-        int(2 * radius * TILE_SIZE * zoom_level)
+        int((center_x - radius) * scale + offset_x),
+        int((center_y - radius) * scale + offset_y),
+        size,
+        size
     )
 
     if bounding_box_rect.collidepoint(mouse_pos):
         pygame.draw.rect(screen, (255, 255, 0), bounding_box_rect, 2)  # Yellow highlight
+        return bounding_box_rect
+    return None
 
 def handle_zoom(zoom_level: float, event: pygame.event.Event) -> float:
     zoom_direction = event.y  # Positive for scroll up, negative for scroll down
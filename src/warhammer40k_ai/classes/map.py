@@ -1,9 +1,13 @@
 from typing import List, Optional, Tuple
 from enum import Enum, auto
+import numpy as np
 from .unit import Unit
 from .model import Model
-from ..utility.calcs import get_dist, convert_mm_to_inches
+from ..utility.calcs import get_dist, convert_mm_to_inches, obstacles_intersecting
 from ..utility.constants import ENGAGEMENT_RANGE
+from ..utility.quadtree import Quadtree
+from ..utility.obstacle_index import ObstacleIndex
+from shapely import prepare
 from shapely.geometry import Polygon, Point
 from shapely.geometry.base import BaseGeometry    
 from shapely.affinity import scale, translate
@@ -23,6 +27,13 @@ class Map:
         self.deployment_zones = {}
         self.units = []
         self.occupied_positions = set()
+        # Spatial index over unit extents, dropped when a unit is placed and rebuilt lazily once Unit.state_version
+        # shows a unit moved or lost models
+        self._unit_quadtree = None
+        self._unit_quadtree_version = None
+        # Spatial index over obstacle polygons, rebuilt lazily whenever obstacles are added (see get_obstacle_index)
+        self._obstacle_index = None
+        self._obstacle_index_key = None
 
     def create_boundary_polygon(self) -> Polygon:
         """
@@ -43,6 +54,14 @@ class Map:
     def add_obstacle(self, obstacle: 'Obstacle') -> None:
         self.obstacles.append(obstacle)
 
+    def get_obstacle_index(self) -> ObstacleIndex:
+        """Return the spatial index over the map's obstacles, shared by every path search on this map."""
+        key = (id(self.obstacles), len(self.obstacles))
+        if key != self._obstacle_index_key:
+            self._obstacle_index = ObstacleIndex(self.obstacles)
+            self._obstacle_index_key = key
+        return self._obstacle_index
+
     def add_objective(self, objective: 'Objective') -> None:
         self.objectives.append(objective)
 
@@ -58,6 +77,7 @@ class Map:
             if self.check_collision_with_other_units(model):
                 return False
         self.units.append(unit)
+        self._unit_quadtree = None
         return True
 
     def get_all_models(self, units: Optional[List[Unit]] = None) -> List[Model] :
@@ -68,6 +88,21 @@ class Map:
             all_models.extend(unit.models)
         return all_models
 
+    def get_units_in_area(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[Unit]:
+        """Return the units whose extent (model bases included) overlaps the given box."""
+        version = (Unit.state_version, len(self.units))
+        if self._unit_quadtree is None or self._unit_quadtree_version != version:
+            self._unit_quadtree = Quadtree((0, 0, self.width, self.height))
+            for unit in self.units:
+                bounding_box = unit.get_bounding_box()
+                if bounding_box is None:
+                    continue
+                pad = max(model.model_base.longestDistance() for model in unit.models)
+                self._unit_quadtree.insert((bounding_box[0] - pad, bounding_box[1] - pad,
+                                            bounding_box[2] + pad, bounding_box[3] + pad), unit)
+            self._unit_quadtree_version = version
+        return self._unit_quadtree.query_rect((min_x, min_y, max_x, max_y))
+
     def get_enemy_units(self, faction: str) -> List[Unit]:
         enemy_units = []
         for unit in self.units:
@@ -85,12 +120,11 @@ class Map:
         return self.boundary.contains(test_shape)
 
     def is_within_engagement_range(self, position: Tuple[float, float, float], target: Unit) -> bool:
-        for model in target.models:
-            target_position = model.get_location()
-            distance = get_dist(position[0] - target_position[0], position[1] - target_position[1])
-            if distance <= ENGAGEMENT_RANGE:
-                return True
-        return False
+        if not target.models:
+            return False
+        target_positions = target.get_positions_array()
+        offsets = target_positions - (position[0], position[1])
+        return bool(((offsets * offsets).sum(axis=1) <= ENGAGEMENT_RANGE * ENGAGEMENT_RANGE).any())
 
     def calculate_pivot_cost(self, unit: Unit) -> float:
         """
@@ -109,22 +143,30 @@ class Map:
         shape = model.model_base.get_base_shape()
         if destination:
             shape = translate(shape, destination[0] - model.model_base.x, destination[1] - model.model_base.y)
-        for obstacle in self.obstacles:
-            #print(f"{model.parent_unit.name} checking collision with obstacles :: {obstacle.polygon}")
-            if shape.intersects(obstacle.polygon):
-                return True
-        return False
+        return bool(obstacles_intersecting(shape, self.get_obstacle_index()))
 
     def check_collision_with_other_units(self, model: Model, destination: Tuple[float, float] = None) -> bool:
-        for unit in self.units:
-            if unit != model.parent_unit:  #  inter-unit collisions check done elsewhere
-                test_shape = model.model_base.get_base_shape()
-                if destination:
-                    test_shape = translate(test_shape, destination[0] - model.model_base.x, destination[1] - model.model_base.y)
-                for other_model in unit.models:
-                    if test_shape.intersects(other_model.model_base.get_base_shape()):
-                        return True
-        return False
+        base = model.model_base
+        x, y = destination if destination else (base.x, base.y)
+        reach = base.longestDistance()
+        # Only units whose extent overlaps the base can collide with it
+        other_models = [other_model for unit in self.get_units_in_area(x - reach, y - reach, x + reach, y + reach)
+                        if unit != model.parent_unit  #  inter-unit collisions check done elsewhere
+                        for other_model in unit.models]
+        if not other_models:
+            return False
+
+        # Bases further apart than the sum of their longest extents can't touch, so only the rest need the exact check
+        others = np.array([(other_model.model_base.x, other_model.model_base.y, other_model.model_base.longestDistance())
+                           for other_model in other_models], dtype=np.float64)
+        dx = others[:, 0] - x
+        dy = others[:, 1] - y
+        near = np.flatnonzero(dx * dx + dy * dy <= (others[:, 2] + reach) ** 2)
+        if near.size == 0:
+            return False
+
+        test_shape = base.get_base_shape_at(x, y, base.facing)
+        return any(test_shape.intersects(other_models[i].model_base.get_base_shape()) for i in near.tolist())
 
 
 class ObstacleType(Enum):
@@ -146,6 +188,10 @@ class Obstacle:
         else:
             self.polygon = Polygon(vertices)
         self.center = (self.polygon.centroid.x, self.polygon.centroid.y)
+        # Axis-aligned bounding box (min_x, min_y, max_x, max_y), used to skip exact intersection tests
+        self.bounds = self.polygon.bounds
+        # Obstacles never move, so build the polygon's prepared-geometry index once for every intersects() test
+        prepare(self.polygon)
         self.color = 'red'
 
 
@@ -161,8 +207,7 @@ class ObjectivePoint:
         # Determine which player controls the objective based on nearby units
         player_oc = {}
         for player in game_state.players:
-            for unit in player.army.units:
-                player_oc[player] = sum([model.objective_control for model in unit.models if get_dist(self.x - model.x, self.y - model.y) <= self.control_radius])
+            player_oc[player] = sum(unit.objective_control_in_range(self.x, self.y, self.control_radius) for unit in player.army.units)
         if player_oc:
             max_oc = max(player_oc.values())
             max_players = [player for player, oc in player_oc.items() if oc == max_oc]
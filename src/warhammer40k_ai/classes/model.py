@@ -1,4 +1,4 @@
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Set, Sequence
 from .wargear import Wargear
 from .ability import Ability
 from .status_effects import UnitStatsModifier
@@ -6,12 +6,19 @@ from ..utility.model_base import Base
 import uuid
 import logging
 from math import degrees
+import numpy as np
 from ..utility.calcs import get_dist, get_angle
 
 
 logging.basicConfig(format="%(asctime)s %(levelname)-8s %(message)s")
 logger = logging.getLogger(__name__)
 
+# Row layout of a unit's model_stats table (one row per model, see Unit._build_model_stats)
+MODEL_DTYPE = np.dtype([
+    ('M', 'i1'), ('T', 'i1'), ('Sv', 'i1'), ('inv_sv', 'i1'), ('W', 'i2'), ('Ld', 'i1'), ('OC', 'i1'),
+    ('W_cur', 'i2'), ('x', 'f8'), ('y', 'f8'), ('alive', '?'),
+])
+
 
 class Model:
     """Represents a Warhammer 40k model with its attributes and wargear."""
@@ -37,13 +44,15 @@ class Model:
         self._objective_control = objective_control
 
         self.model_base = model_base
-        self.wargear: List[Wargear] = []
+        self.wargear: Sequence[Wargear] = ()  # May be a tuple shared with the parent unit
         self.abilities: Dict[Ability] = {}
-        self.optional_wargear: List[str] = []
+        self.optional_wargear: Set[str] = set()
 
         # Gameplay related attributes
         self._id = str(uuid.uuid4())  # Generate a unique ID for each model
         self.parent_unit = None
+        self._stat_index: Optional[int] = None  # Slot in parent_unit.model_stats, if any
+        self._unit_index: Optional[int] = None  # Position in parent_unit.models, if any
         self.last_move_path = []
 
     @property
@@ -78,11 +87,14 @@ class Model:
 
     def add_wargear(self, wargear: Wargear) -> None:
         """Add wargear to the model."""
+        if isinstance(self.wargear, tuple):
+            # Copy-on-write: stop sharing the unit's wargear tuple before mutating
+            self.wargear = list(self.wargear)
         self.wargear.append(wargear)
     
     def add_optional_wargear(self, wargear: str) -> None:
         """Add optional wargear to the model."""
-        self.optional_wargear.append(wargear)
+        self.optional_wargear.add(wargear)
 
     def get_optional_wargear_by_name(self, wargear_name: str) -> Optional[Ability]:
         for wargear in self.optional_wargear:
@@ -106,6 +118,11 @@ class Model:
         self.model_base.y = y
         self.model_base.z = z
         self.model_base.set_facing(facing)
+        if self._stat_index is not None:
+            row = self.parent_unit.model_stats[self._stat_index]
+            row['x'] = x
+            row['y'] = y
+            self.parent_unit._state_changed()
 
     def get_location(self) -> Tuple[float, float, float, float]:
         """Get the location and facing of the model."""
@@ -199,6 +216,12 @@ class Model:
         else:
             return 0.0
 
+    def _write_stat(self, column: str, value: int) -> None:
+        """Mirror a changed stat into this model's row of parent_unit.model_stats, if it has one."""
+        if self._stat_index is not None:
+            self.parent_unit.model_stats[column][self._stat_index] = value
+            self.parent_unit._state_changed()
+
     @property
     def movement(self) -> int:
         if hasattr(self.parent_unit.stats, 'movement'):
@@ -211,6 +234,7 @@ class Model:
     @movement.setter
     def movement(self, value: int) -> None:
         self._movement = value
+        self._write_stat("M", value)
 
     @property
     def toughness(self) -> int:
@@ -224,6 +248,7 @@ class Model:
     @toughness.setter
     def toughness(self, value: int) -> None:
         self._toughness = value
+        self._write_stat("T", value)
 
     @property
     def save(self) -> int:
@@ -237,6 +262,7 @@ class Model:
     @save.setter
     def save(self, value: int) -> None:
         self._save = value
+        self._write_stat("Sv", value)
 
     @property
     def inv_save(self) -> Optional[int]:
@@ -249,6 +275,7 @@ class Model:
     @wounds.setter
     def wounds(self, value: int) -> None:
         self._wounds = value
+        self._write_stat("W_cur", value)
 
     @property
     def leadership(self) -> int:
@@ -262,6 +289,7 @@ class Model:
     @leadership.setter
     def leadership(self, value: int) -> None:
         self._leadership = value
+        self._write_stat("Ld", value)
 
     @property
     def objective_control(self) -> int:
@@ -275,6 +303,7 @@ class Model:
     @objective_control.setter
     def objective_control(self, value: int) -> None:
         self._objective_control = value
+        self._write_stat("OC", value)
 
     ################
     ### String Representation
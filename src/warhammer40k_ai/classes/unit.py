@@ -1,17 +1,22 @@
 import logging
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Sequence, Union
 from typing import TYPE_CHECKING
-from .model import Model
+from .model import Model, MODEL_DTYPE
 from ..utility.model_base import Base, BaseType
 from .wargear import Wargear, WargearOption
 from .ability import Ability
 from ..utility.range import Range
-from ..utility.calcs import get_dist, get_angle, convert_mm_to_inches, a_star, simplify_path, get_pivot_cost, angle_difference, can_end_move_on_terrain
-from ..utility.dice import get_roll
+from ..utility.calcs import get_dist, get_dist_batch, get_angle, convert_mm_to_inches, a_star, simplify_path, get_pivot_cost, angle_difference, can_end_move_on_terrain
+from ..utility.dice import get_roll, get_dice_rolls, NP_RNG
 from .status_effects import StatusEffect
 from ..utility.constants import VIEWING_ANGLE
 import math
+import re
 import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from array import array
+from bisect import bisect_right
 import random
 import copy
 import numpy as np
@@ -26,6 +31,7 @@ logging.basicConfig(format="%(asctime)s %(levelname)-8s %(message)s")
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
 class UnitRoundState:
     remained_stationary_this_round: bool = False
     advanced_this_round: bool = False
@@ -35,6 +41,16 @@ class UnitRoundState:
     declared_charge_this_round: bool = False
     num_lost_models_this_round: int = 0
 
+    def reset(self) -> None:
+        """Reset all fields to their defaults in place."""
+        self.remained_stationary_this_round = False
+        self.advanced_this_round = False
+        self.shot_this_round = False
+        self.fell_back_this_round = False
+        self.reinforced_this_round = False
+        self.declared_charge_this_round = False
+        self.num_lost_models_this_round = 0
+
 
 class MovementAction:
     REMAIN_STATIONARY = 0
@@ -48,26 +64,219 @@ class MovementState:
     OUT_OF_ENGAGEMENT_RANGE = 1
 
 
+def _wound_target(strength: int, toughness: int) -> int:
+    if strength >= 2 * toughness:
+        return 2
+    if strength > toughness:
+        return 3
+    if strength == toughness:
+        return 4
+    if 2 * strength <= toughness:
+        return 6
+    return 5
+
+
+def _resolve_hits(t_arr: np.ndarray, sv_arr: np.ndarray, inv_sv_arr: np.ndarray, w_max: np.ndarray, w_cur: np.ndarray,
+                  alive: np.ndarray, hits: int, strength: int, ap: int, damage: int) -> np.ndarray:
+    """
+    Resolve wound rolls, saving throws and damage allocation for `hits` attacks against a
+    unit's stat block in a handful of array operations.
+
+    Wound rolls are made before allocation, against the Toughness of the majority of the alive models
+    (the highest of them on a tie). Attacks go to models that have already lost wounds first, then to
+    the models with the fewest wounds left. Each save is taken by the model the attack is allocated to,
+    with the better of its armour save (worsened by ap) and its invulnerable save (0 in inv_sv_arr
+    means none).
+
+    Returns:
+        np.ndarray: The remaining wounds for every slot of the stat block
+    """
+    w_new = w_cur.copy()
+    order = np.flatnonzero(alive)
+    if hits <= 0 or damage <= 0 or order.size == 0:
+        return w_new
+    # Attacks must be allocated to already wounded models first (lexsort's last key is the primary one)
+    order = order[np.lexsort((w_cur[order], w_cur[order] >= w_max[order]))]
+
+    toughness, counts = np.unique(t_arr[order], return_counts=True)
+    majority_toughness = int(toughness[len(counts) - 1 - int(np.argmax(counts[::-1]))])
+    wound_rolls = get_dice_rolls(hits)
+    wound_target = _wound_target(strength, majority_toughness)
+    wounds = int(((wound_rolls > 1) & (wound_rolls >= wound_target)).sum())
+    save_rolls = get_dice_rolls(wounds)
+    save_targets = sv_arr[order].astype(np.int64) - ap
+    inv_sv = inv_sv_arr[order]
+    save_targets = np.where(inv_sv > 0, np.minimum(save_targets, inv_sv), save_targets)
+    # Excess damage is lost, so each model soaks ceil(W / D) failed saves before being destroyed
+    to_slay = -(-w_new[order] // damage)
+
+    # Walk the allocation order, each model rolling saves until it is destroyed or the wounds run out
+    next_roll = 0
+    for slot, save_target, needed in zip(order.tolist(), save_targets.tolist(), to_slay.tolist()):
+        if next_roll >= wounds:
+            break
+        rolls = save_rolls[next_roll:]
+        failed = np.cumsum((rolls == 1) | (rolls < save_target))
+        if failed[-1] < needed:
+            w_new[slot] -= int(failed[-1]) * damage
+            break
+        w_new[slot] = 0
+        next_roll += int(np.searchsorted(failed, needed)) + 1
+    return w_new
+
+
+# Directions searched, in order, when placing the next model of a unit
+_PLACEMENT_DIRECTIONS = np.array([
+    (0, 1), (1, 1), (1, 0), (1, -1),
+    (0, -1), (-1, -1), (-1, 0), (-1, 1)
+], dtype=np.float64)
+# Angle of each placement direction, as passed to Base.getRadius_batch (see _find_strategic_position)
+_PLACEMENT_DIRECTION_ANGLES = tuple(get_angle(dy, dx) for dx, dy in _PLACEMENT_DIRECTIONS.tolist())
+
+
+def _placement_candidates(last_x: float, last_y: float, radii: List[float], coherency_distance: float,
+                          placed: np.ndarray, min_separation_sq: float) -> np.ndarray:
+    """
+    Generate candidate positions for the next model, stepping out 0.1" at a time from the last placed
+    model along each of _PLACEMENT_DIRECTIONS (ordered by direction, then distance). Candidates closer
+    than sqrt(min_separation_sq) to any already placed model are dropped.
+
+    Returns:
+        np.ndarray: (N, 2) array of candidate x, y positions
+    """
+    chunks = []
+    for (dx, dy), radius in zip(_PLACEMENT_DIRECTIONS, radii):
+        distances = np.arange(radius + 0.1, radius + coherency_distance, 0.1)
+        chunks.append(np.column_stack((last_x + distances * dx, last_y + distances * dy)))
+    return _separated_candidates(np.concatenate(chunks), placed, min_separation_sq)
+
+
+# Number of random candidates drawn per retry once the fixed directions are exhausted
+_RANDOM_PLACEMENT_SAMPLES = 32
+
+# Unit vectors random candidates are drawn along; 256 headings are plenty for a placement search
+# and sampling them by index avoids evaluating cos/sin for every candidate
+_RANDOM_PLACEMENT_HEADINGS = np.linspace(0.0, 2 * np.pi, 256, endpoint=False)
+_RANDOM_PLACEMENT_UNIT_VECTORS = np.column_stack((np.cos(_RANDOM_PLACEMENT_HEADINGS), np.sin(_RANDOM_PLACEMENT_HEADINGS)))
+
+
+def _random_placement_candidates(last_x: float, last_y: float, min_distance: float, max_distance: float,
+                                 placed: np.ndarray, min_separation_sq: float) -> np.ndarray:
+    """
+    Draw _RANDOM_PLACEMENT_SAMPLES candidate positions over the annulus between min_distance and
+    max_distance around the last placed model, along randomly picked _RANDOM_PLACEMENT_UNIT_VECTORS,
+    dropping those too close to an already placed model.
+
+    Returns:
+        np.ndarray: (N, 2) array of candidate x, y positions
+    """
+    headings = _RANDOM_PLACEMENT_UNIT_VECTORS[NP_RNG.integers(len(_RANDOM_PLACEMENT_UNIT_VECTORS), size=_RANDOM_PLACEMENT_SAMPLES)]
+    distances = NP_RNG.uniform(min_distance, max_distance, _RANDOM_PLACEMENT_SAMPLES)
+    candidates = headings * distances[:, None] + (last_x, last_y)
+    return _separated_candidates(candidates, placed, min_separation_sq)
+
+
+def _separated_candidates(candidates: np.ndarray, placed: np.ndarray, min_separation_sq: float) -> np.ndarray:
+    # Squared distance from every candidate to every placed model in one broadcast
+    offsets = candidates[:, None, :] - placed[None, :, :]
+    dist_sq = (offsets * offsets).sum(axis=2)
+    return candidates[(dist_sq > min_separation_sq).all(axis=1)]
+
+
+_BASE_RE = re.compile(r'(\d+)\s*(?:x\s*(\d+))?\s*mm')
+
+
+@lru_cache(maxsize=128)
+def _parse_base_dimensions(base_size: str) -> Tuple[BaseType, Union[float, Tuple[float, float]]]:
+    """
+    Parse a datasheet base size into a base type and radius in inches.
+    Handles both circular ("32mm") and elliptical ("32 x 16mm") bases.
+    """
+    m = _BASE_RE.match(base_size)
+    if m is None:
+        raise ValueError(f"Invalid base size: {base_size}")
+    major, minor = m.groups()
+    if minor is None:
+        return BaseType.CIRCULAR, convert_mm_to_inches(int(major) / 2.0)
+    return BaseType.ELLIPTICAL, (convert_mm_to_inches(int(major) / 2.0), convert_mm_to_inches(int(minor) / 2.0))
+
+
+@lru_cache(maxsize=None)
+def _parse_wargear_option(option: str) -> Optional[WargearOption]:
+    """
+    Parse a datasheet option description such as "1 Bloodletter can be equipped with 1 instrument of Chaos"
+    into a WargearOption. Option text is fixed per datasheet, so results are cached and shared between units:
+    the returned WargearOption must never be mutated.
+    """
+    # Parse the option string
+    parts = option.split(' can be equipped with ')
+    if len(parts) != 2:
+        logger.warning("Invalid wargear option format: %s", option)
+        return None
+
+    model_description, item_description = parts
+    model_count = 1  # Default to 1 model
+    
+    # Extract model count if specified
+    head, _, rest = model_description.partition(' ')
+    if head.isdigit():
+        model_count = int(head)
+        model_description = rest
+
+    item_count = 1 # Default to 1 item
+    # Extract item count if specified
+    head, _, rest = item_description.partition(' ')
+    if head.isdigit():
+        item_count = int(head)
+        item_description = rest.strip().replace('.', '')
+
+    # Parse "not equipped with" condition
+    not_equipped_with = None
+    if "that is not equipped with" in model_description:
+        model_parts = model_description.split("that is not equipped with")
+        model_description = model_parts[0].strip()
+        not_equipped_with = model_parts[1].strip()
+        # Remove leading "a" or "an" from not_equipped_with
+        if not_equipped_with.startswith("a "):
+            not_equipped_with = not_equipped_with[2:].strip()
+        elif not_equipped_with.startswith("an "):
+            not_equipped_with = not_equipped_with[3:].strip()
+
+    return WargearOption(item_description, model_description, model_count, item_count, not_equipped_with)
+
+
 class Unit:
+    # Bumped whenever any unit's models move, turn, take damage or are added/removed, a unit's position changes
+    # or status effects are applied or expire; caches built over many units (map quadtree, UI hover grid and
+    # redraw) key on it
+    state_version = 0
+
     def __init__(self, datasheet, quantity=None, enhancement=None):
         self._id = str(uuid.uuid4())
         self._datasheet = datasheet
         self.name = datasheet.name
         self.faction = datasheet.faction_data["name"]
-        self.keywords = getattr(datasheet, 'keywords', [])  # Use getattr with a default value
-        self.faction_keywords = getattr(datasheet, 'faction_keywords', [])  # Use getattr with a default value
+        # Optional datasheet fields are plain instance attributes, so probe the instance dict directly
+        ds_dict = getattr(datasheet, '__dict__', {})
+        self.keywords = ds_dict.get('keywords', [])
+        self.faction_keywords = ds_dict.get('faction_keywords', [])
+        self._keywords_set = frozenset(self.keywords)  # O(1) lookups for the is_* keyword properties
+        # Keywords are fixed, so resolve the terrain rules checked for every obstacle on a path once
+        self.can_enter_ruins = self.is_infantry or self.is_beast or self.is_belisarius_cawl or self.is_imperium_primarch
         self.unit_composition = self._parse_unit_composition(datasheet.datasheets_unit_composition)
         self.models_cost = self._parse_models_cost(datasheet.datasheets_models_cost)
         self.models = self._create_models(datasheet, quantity)
+        self._build_model_stats()
         self.possible_wargear = self._parse_wargear(datasheet)
         self.wargear_options = None
         self._parse_wargear_options(datasheet) # this needs to here, sets above variable
         self.possible_abilities = self._parse_abilities(datasheet)
-        self.can_be_attached_to = getattr(datasheet, 'attached_to', [])
+        self.can_be_attached_to = ds_dict.get('attached_to', [])
 
-        if hasattr(datasheet, 'damaged_w') and datasheet.damaged_w:
-            self.damaged_profile = self._parse_range(datasheet.damaged_w)
-            self.damaged_profile_desc = getattr(datasheet, 'damaged_description', None)
+        damaged_w = ds_dict.get('damaged_w')
+        if damaged_w:
+            self.damaged_profile = self._parse_range(damaged_w)
+            self.damaged_profile_desc = ds_dict.get('damaged_description')
         else:
             self.damaged_profile = None
             self.damaged_profile_desc = None
@@ -100,17 +309,9 @@ class Unit:
         return Range.from_string(range_string)
 
     def _parse_base_size(self, base_size: str) -> Base:
-        base_size = base_size.replace("mm", "")
-        # Parse the base size from the datasheet
-        if 'x' in base_size:
-            # This handles the elliptical example: "32 x 16mm"
-            major, minor = base_size.split("x")
-            major = convert_mm_to_inches(int(major.strip()) / 2.0)
-            minor = convert_mm_to_inches(int(minor.strip()) / 2.0)
-            return Base(BaseType.ELLIPTICAL, (major, minor))
-        else:
-            # This handles the standard example: "32mm"
-            return Base(BaseType.CIRCULAR, convert_mm_to_inches(int(base_size.strip()) / 2.0))
+        # Bases carry per-model position state, so only the parsed dimensions are shared
+        base_type, radius = _parse_base_dimensions(base_size)
+        return Base(base_type, radius)
 
     def _parse_unit_composition(self, unit_composition):
         result = {}
@@ -159,26 +360,52 @@ class Unit:
                 break
         return models
 
-    def _parse_wargear(self, datasheet):
+    def _build_model_stats(self) -> None:
+        """
+        Mirror the per-model stats into a NumPy structured array (one MODEL_DTYPE row per model)
+        so the whole unit can be processed with vectorised sweeps, e.g. model_stats['OC'].sum().
+        Removed models keep their row but are cleared from the "alive" column.
+        """
+        for model in getattr(self, '_stat_models', []):
+            model._stat_index = None
+        self._stat_models = list(self.models)
+        stats = np.zeros(len(self._stat_models), dtype=MODEL_DTYPE)
+        for i, model in enumerate(self._stat_models):
+            model._stat_index = i
+            model._unit_index = i
+            stats[i] = (model._movement, model._toughness, model._save, model._inv_save or 0,
+                        model._base_wounds, model._leadership, model._objective_control,
+                        model.wounds, model.model_base.x, model.model_base.y, True)
+        self.model_stats = stats
+        # model_stats row of each entry in self.models, kept in step with remove_model's swap-pop
+        self._model_rows = np.arange(len(self._stat_models))
+        self._state_changed()
+
+    def _parse_wargear(self, datasheet) -> Tuple[Wargear, ...]:
         possible_wargear = []
+        by_name: Dict[str, Wargear] = {}
         if hasattr(datasheet, 'datasheets_wargear'):
             for wargear_data in datasheet.datasheets_wargear:
                 #print(f"Parsing wargear {wargear_data['name']}")
                 if ' – ' in wargear_data['name']:
                     name, profile = wargear_data['name'].split(' – ')
-                    if name not in [wargear.name for wargear in possible_wargear]:
+                    existing = by_name.get(name.replace('’', "'"))
+                    if existing is None:
                         #print(f"Adding wargear {name} with profile {profile}")
-                        possible_wargear.append(Wargear(wargear_data))
+                        wargear = Wargear(wargear_data)
+                        by_name[wargear.name] = wargear
+                        possible_wargear.append(wargear)
                     else:
-                        for wargear in possible_wargear:
-                            if wargear.name == name:
-                                #print(f"Adding profile {profile} to wargear {name}")
-                                wargear.add_profile(profile, wargear_data)
-                                break
+                        #print(f"Adding profile {profile} to wargear {name}")
+                        existing.add_profile(profile, wargear_data)
                 else:
                     #print(f"Adding wargear {wargear_data['name']}")
-                    possible_wargear.append(Wargear(wargear_data))
-        return possible_wargear
+                    wargear = Wargear(wargear_data)
+                    # Later profiles of the same name are added to the first wargear of that name
+                    by_name.setdefault(wargear.name, wargear)
+                    possible_wargear.append(wargear)
+        # Never changes after parsing, so models can share it (see add_wargear)
+        return tuple(possible_wargear)
 
     def _parse_wargear_options(self, datasheet) -> None:
         wargear_options = []
@@ -206,41 +433,10 @@ class Unit:
                                             ability["parameter"]))
         return abilities
 
-    def parse_wargear_option(self, option: str, result: Dict[str, List[WargearOption]]):
-        # Parse the option string
-        parts = option.split(' can be equipped with ')
-        if len(parts) != 2:
-            print(f"Invalid wargear option format: {option}")
-            return
-
-        model_description, item_description = parts
-        model_count = 1  # Default to 1 model
-        
-        # Extract model count if specified
-        if model_description.startswith(('1 ', '2 ', '3 ', '4 ', '5 ', '6 ', '7 ', '8 ', '9 ')):
-            model_count = int(model_description.split()[0])
-            model_description = ' '.join(model_description.split()[1:])
-
-        item_count = 1 # Default to 1 item
-        # Extract item count if specified
-        if item_description.startswith(('1 ', '2 ', '3 ', '4 ', '5 ', '6 ', '7 ', '8 ', '9 ')):
-            item_count = int(item_description.split()[0])
-            item_description = ' '.join(item_description.split()[1:]).strip().replace('.', '')
-
-        # Parse "not equipped with" condition
-        not_equipped_with = None
-        if "that is not equipped with" in model_description:
-            model_parts = model_description.split("that is not equipped with")
-            model_description = model_parts[0].strip()
-            not_equipped_with = model_parts[1].strip()
-            # Remove leading "a" or "an" from not_equipped_with
-            if not_equipped_with.startswith("a "):
-                not_equipped_with = not_equipped_with[2:].strip()
-            elif not_equipped_with.startswith("an "):
-                not_equipped_with = not_equipped_with[3:].strip()
-
-        if item_description.lower() not in result.keys():
-            result[item_description.lower()] = WargearOption(item_description, model_description, model_count, item_count, not_equipped_with)
+    def parse_wargear_option(self, option: str, result: Dict[str, WargearOption]):
+        wargear_option = _parse_wargear_option(option)
+        if wargear_option is not None and wargear_option.wargear_name not in result:
+            result[wargear_option.wargear_name] = wargear_option
 
     def parse_wargear_options(self, options: List[str]):
         result = {}
@@ -252,12 +448,14 @@ class Unit:
         self.wargear_options = result
 
     def apply_wargear_option(self, wargear_option: WargearOption):
+        # A unit only has a couple of distinct model names, so match each name against the option once
+        name_matches = {name: name in wargear_option.model_name for name in {model.name for model in self.models}}
         # Find eligible models
         eligible_models = [
             model for model in self.models
-            if model.name in wargear_option.model_name and
+            if name_matches[model.name] and
             wargear_option.wargear_name not in model.optional_wargear and
-            (wargear_option.exclude_name is None or wargear_option.exclude_name.lower() not in model.optional_wargear)
+            (wargear_option.exclude_name is None or wargear_option.exclude_name not in model.optional_wargear)
         ]
 
         if len(eligible_models) < wargear_option.model_quantity:
@@ -267,7 +465,7 @@ class Unit:
         for model in eligible_models:
             if count >= wargear_option.item_quantity:
                 break
-            model.optional_wargear.append(wargear_option.wargear_name)
+            model.optional_wargear.add(wargear_option.wargear_name)
             count += 1
 
     def apply_wargear_options(self, wargear_name: Optional[str] = None) -> None:
@@ -279,20 +477,18 @@ class Unit:
             else:
                 self.apply_wargear_option(self.wargear_options[optional_wargear_name])
 
-    def add_wargear(self, wargear: List[Wargear]=[], model_name: str=None) -> None:
-        for model_instance in self.models:
-            wargear_to_add = []
-            if not wargear:
-                for wargear_instance in self.possible_wargear:
-                    wargear_to_add.append(wargear_instance)
+    def add_wargear(self, wargear: Optional[Sequence[Wargear]] = None, model_name: str = None) -> None:
+        wargear_to_add = tuple(wargear) if wargear else self.possible_wargear
+        if model_name:
+            models = [model_instance for model_instance in self.models if model_instance.name == model_name]
+        else:
+            models = self.models
+        for model_instance in models:
+            # Unequipped models share the tuple itself; Model.add_wargear copies before mutating
+            if model_instance.wargear:
+                model_instance.wargear = (*model_instance.wargear, *wargear_to_add)
             else:
-                wargear_to_add.extend(wargear)
-            for wargear_instance in wargear_to_add:
-                if model_name:
-                    if model_instance.name == model_name:
-                        model_instance.wargear.append(wargear_instance)
-                else:
-                    model_instance.wargear.append(wargear_instance)
+                model_instance.wargear = wargear_to_add
 
     def add_ability(self, ability: Ability, model_name: str=None, quantity: int=1000) -> None:
         """Add ability to the unit."""
@@ -309,12 +505,23 @@ class Unit:
 
     # Remove a Model from a Unit (e.g., when it dies)
     def remove_model(self, model: Model, fleed: bool = False) -> None:
-        assert model in self.models
+        idx = model._unit_index
+        assert idx is not None and self.models[idx] is model
 
-        # Remove model itself
+        # Remove model itself, swapping the last model into its slot rather than shifting the list
         self.round_state.num_lost_models_this_round += 1
         self.models_lost.append(model)
-        self.models.remove(model)
+        last = self.models.pop()
+        if last is not model:
+            self.models[idx] = last
+            last._unit_index = idx
+            self._model_rows[idx] = self._model_rows[len(self.models)]
+        self._model_rows = self._model_rows[:len(self.models)]
+        self._state_changed()
+        model._unit_index = None
+        if model._stat_index is not None:
+            self.model_stats["alive"][model._stat_index] = False
+            model._stat_index = None
 
         logger.info(f"Unit has {len(self.models)} models left!")
         #if len(self.models) < 1:
@@ -327,6 +534,7 @@ class Unit:
         assert model not in self.models
         model.set_parent_unit(self)
         self.models.append(model)
+        self._build_model_stats()
         self.update_coherency()
 
     def update_coherency(self) -> None:
@@ -342,9 +550,15 @@ class Unit:
 
     def initialize_round(self) -> None:
         """Reset round-tracked variables to default state."""
-        self.round_state = UnitRoundState()
+        round_state = getattr(self, 'round_state', None)
+        if round_state is None:
+            self.round_state = UnitRoundState()
+        else:
+            round_state.reset()
         for status_effect in self.status_effects:
             status_effect.check_expiration(self)
+        if self.status_effects:
+            Unit.state_version += 1
 
     def is_max_health(self) -> Tuple[bool, Optional[Model]]:
         """
@@ -355,25 +569,70 @@ class Unit:
                 - A boolean indicating if the unit is at full health
                 - The first damaged model found, or None if all models are at full health
         """
-        for model in self.models:
-            if not model.is_max_health():
-                return False, model
-        return True, None
+        stats = self.model_stats
+        damaged = (stats["W_cur"] < stats["W"]) & stats["alive"]
+        if not damaged.any():
+            return True, None
+        return False, self._stat_models[int(damaged.argmax())]
+
+    def get_positions_array(self) -> np.ndarray:
+        """Return the (x, y) position of every model, in self.models order, as an (N, 2) array."""
+        rows = self.model_stats[self._model_rows]
+        return np.column_stack((rows["x"], rows["y"]))
+
+    def _state_changed(self) -> None:
+        """Drop this unit's cached bounding box and invalidate caches keyed on Unit.state_version."""
+        self._bounding_box = None
+        Unit.state_version += 1
+
+    def get_bounding_box(self) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Return (min_x, min_y, max_x, max_y) of the model centres, or None for a unit without models.
+        Cached until a model moves or is removed.
+        """
+        if self._bounding_box is None and self.models:
+            positions = self.get_positions_array()
+            (min_x, min_y), (max_x, max_y) = positions.min(axis=0).tolist(), positions.max(axis=0).tolist()
+            self._bounding_box = (min_x, min_y, max_x, max_y)
+        return self._bounding_box
+
+    def objective_control_in_range(self, x: float, y: float, radius: float) -> int:
+        """Return the summed OC of this unit's models within `radius` inches of (x, y)."""
+        stats = self.model_stats[self.model_stats["alive"]]
+        dx, dy = stats["x"] - x, stats["y"] - y
+        in_range = dx * dx + dy * dy <= radius * radius
+        return int(stats["OC"][in_range].sum())
+
+    def roll_saves(self, ap: int = 0) -> np.ndarray:
+        """
+        Roll one saving throw for every model in the unit at once.
+
+        Args:
+            ap (int): Armour Penetration of the attack (0 or negative)
+
+        Returns:
+            np.ndarray: Boolean array, in model_stats slot order for alive models, of which saves passed
+        """
+        stats = self.model_stats
+        required = stats["Sv"][stats["alive"]] - ap
+        rolls = get_dice_rolls(len(required))
+        # An unmodified roll of 1 always fails
+        return (rolls > 1) & (rolls >= required)
 
     def make_leadership_check(self) -> bool:
         return get_roll("2D6") < self.leadership
 
     @property
     def is_epic_hero(self) -> bool:
-        return "Epic Hero" in self.keywords
+        return "Epic Hero" in self._keywords_set
 
     @property
     def is_battleline(self) -> bool:
-        return "Battleline" in self.keywords
+        return "Battleline" in self._keywords_set
 
     @property
     def is_dedicated_transport(self) -> bool:
-        return "Dedicated Transport" in self.keywords
+        return "Dedicated Transport" in self._keywords_set
 
     @property
     def is_leader(self) -> bool:
@@ -381,59 +640,59 @@ class Unit:
 
     @property
     def is_supreme_commander(self) -> bool:
-        return "Supreme Commander" in [ability.name for ability in self.possible_abilities]
+        return any(ability.name == "Supreme Commander" for ability in self.possible_abilities)
 
     @property
     def is_monster(self) -> bool:
-        return "Monster" in self.keywords
+        return "Monster" in self._keywords_set
 
     @property
     def is_vehicle(self) -> bool:
-        return "Vehicle" in self.keywords
+        return "Vehicle" in self._keywords_set
 
     @property
     def is_aircraft(self) -> bool:
-        return "Aircraft" in self.keywords
+        return "Aircraft" in self._keywords_set
 
     @property
     def is_fortification(self) -> bool:
-        return "Fortification" in self.keywords
+        return "Fortification" in self._keywords_set
 
     @property
     def is_character(self) -> bool:
-        return "Character" in self.keywords
+        return "Character" in self._keywords_set
 
     @property
     def is_psyker(self) -> bool:
-        return "Psyker" in self.keywords
+        return "Psyker" in self._keywords_set
 
     @property
     def is_infantry(self) -> bool:
-        return "Infantry" in self.keywords
+        return "Infantry" in self._keywords_set
 
     @property
     def is_beast(self) -> bool:
-        return "Beast" in self.keywords
+        return "Beast" in self._keywords_set
 
     @property
     def is_titanic(self) -> bool:
-        return "Titanic" in self.keywords
+        return "Titanic" in self._keywords_set
 
     @property
     def is_towering(self) -> bool:
-        return "Towering" in self.keywords
+        return "Towering" in self._keywords_set
 
     @property
     def is_flying(self) -> bool:
-        return "Fly" in self.keywords
+        return "Fly" in self._keywords_set
 
     @property
     def is_belisarius_cawl(self) -> bool:
-        return "Belisarius Cawl" in self.keywords
+        return "Belisarius Cawl" in self._keywords_set
 
     @property
     def is_imperium_primarch(self) -> bool:
-        return "Imperium" in self.keywords and "Primarch" in self.keywords
+        return "Imperium" in self._keywords_set and "Primarch" in self._keywords_set
 
     @property
     def has_circular_base(self) -> bool:
@@ -453,17 +712,20 @@ class Unit:
             num_models = int(cost_entry['description'].split()[0])
             cost = int(cost_entry['cost'])
             result[num_models] = cost
+        # Cost brackets never change after parsing, so sort them once here
+        self._models_cost_asc = tuple(sorted(result.items()))
+        self._cost_thresholds = array('i', (threshold for threshold, _ in self._models_cost_asc))
+        self._cost_values = [cost for _, cost in self._models_cost_asc]
         return result
 
     def calculate_points(self, num_models):
-        for threshold, cost in sorted(self.models_cost.items(), reverse=True):
-            if num_models >= threshold:
-                return cost
-        return 0
+        # Thresholds are sorted, so the bracket is the last one not above num_models
+        i = bisect_right(self._cost_thresholds, num_models) - 1
+        return self._cost_values[i] if i >= 0 else 0
 
     def max_models_for_points(self, max_points):
         max_models = 0
-        for num_models, cost in sorted(self.models_cost.items()):
+        for num_models, cost in self._models_cost_asc:
             if cost <= max_points:
                 max_models = num_models
             else:
@@ -484,6 +746,7 @@ class Unit:
     def configure_models(self, count, wargear):
         # Recreate the models with the specified count
         self.models = self._create_models(self._datasheet, count)
+        self._build_model_stats()
         self.update_coherency()
 
         # Apply wargear to all models
@@ -723,11 +986,13 @@ class Unit:
 
         for model, destination in zip(self.models, potential_positions):
             print(f"Model {model._id} {model.name} moving to {destination}")
-            shortest_path = a_star(model, game_map.obstacles, destination)
+            shortest_path = a_star(model, game_map.get_obstacle_index(), destination)
             if not shortest_path:
                 print(f"Cannot move unit {self.name} - model {model._id} path is None")
                 continue  # Model cannot reach destination
-            path_distance = sum(get_dist(shortest_path[i][0] - shortest_path[i-1][0], shortest_path[i][1] - shortest_path[i-1][1]) for i in range(1, len(shortest_path)))
+            # Length of all path segments in one array operation
+            steps = np.diff(np.array([node[:2] for node in shortest_path], dtype=np.float64), axis=0)
+            path_distance = float(get_dist_batch(steps[:, 0], steps[:, 1]).sum())
             if path_distance > model.movement:
                 print(f"Cannot move unit {self.name} - model {model._id} path distance {path_distance} is greater than movement {model.movement}")
                 continue  # Model cannot reach destination
@@ -863,14 +1128,37 @@ class Unit:
 
     def take_damage(self, amount: int):
         pass
+
+    def resolve_attacks(self, hits: int, strength: int, ap: int = 0, damage: int = 1) -> int:
+        """
+        Resolve a batch of successful hits against this unit.
+
+        Args:
+            hits (int): Number of successful hit rolls
+            strength (int): Strength of the attacks
+            ap (int): Armour Penetration of the attacks (0 or negative)
+            damage (int): Damage inflicted by each failed save
+
+        Returns:
+            int: Number of models destroyed
+        """
+        stats = self.model_stats
+        w_new = _resolve_hits(stats["T"], stats["Sv"], stats["inv_sv"], stats["W"], stats["W_cur"], stats["alive"],
+                              hits, strength, ap, damage)
+        num_models = len(self.models)
+        for i in np.flatnonzero(w_new < stats["W_cur"]):
+            self._stat_models[i].take_damage(int(stats["W_cur"][i] - w_new[i]))
+        return num_models - len(self.models)
     
     def apply_status_effect(self, status_effect: StatusEffect) -> None:
         status_effect.apply_effect(self)
         self.status_effects.append(status_effect)
+        Unit.state_version += 1
     
     def remove_status_effect(self, status_effect: StatusEffect) -> None:
         status_effect.remove_effect(self)
         self.status_effects.remove(status_effect)
+        Unit.state_version += 1
     
     def is_alive(self) -> bool:
         return len(self.models) > 0
@@ -878,6 +1166,7 @@ class Unit:
     def set_position(self, x: float, y: float, z: float = 0.0):
         """Set the position of the unit on the map."""
         self.position = (x, y, z)
+        Unit.state_version += 1
 
     def get_position(self):
         if self.position is not None:
@@ -900,6 +1189,7 @@ class Unit:
             self.set_position(x_sum / len(self.models), y_sum / len(self.models), z_sum / len(self.models))
         else:
             self.position = None
+            Unit.state_version += 1
 
     def is_point_inside(self, x, y):
         position = self.get_position()
@@ -909,9 +1199,13 @@ class Unit:
         center_x, center_y, _ = position
         radius = self.coherency_distance  # Assuming this is defined elsewhere in the class
         
-        # Check if the point is within the circular area defined by the unit's position and coherency distance
-        distance = get_dist(x - center_x, y - center_y)
-        return distance <= radius
+        # Check if the point is within the circular area defined by the unit's position and coherency distance;
+        # the bounding square rejects most points before the (squared) distance test
+        dx = x - center_x
+        dy = y - center_y
+        if not (-radius <= dx <= radius and -radius <= dy <= radius):
+            return False
+        return dx * dx + dy * dy <= radius * radius
 
     def calculate_model_positions(self, start_x: float, start_y: float, game_map: 'Map', zoom_level: float = 1.0, seeded_positions: List[Tuple[float, float, float, float]] = []) -> List[Tuple[float, float, float, float]]:
         positions = seeded_positions.copy()
@@ -934,18 +1228,13 @@ class Unit:
                     placed = True
                     break
                 else:
-                    # Try to find a strategic position within coherency distance
-                    valid_positions = self._find_strategic_position(model, positions, game_map)
-                    if not valid_positions:
-                        attempts += 1
-                        continue
-                    # Check collision with all models in the unit, including the current one
-                    for x, y, z, facing in valid_positions:
-                        if not self._collides_with_unit_models(x, y, z, facing, positions):
-                            if self._is_coherent_within_unit(x, y, z, facing, positions):
-                                positions.append((x, y, z, facing))
-                                placed = True
-                                break
+                    # Try to find a strategic position within coherency distance; it has already been checked
+                    # against the map and for collision and coherency with the models placed so far
+                    position = self._find_strategic_position(model, positions, game_map, attempts)
+                    if position is not None:
+                        positions.append(position)
+                        placed = True
+                        break
                 attempts += 1
 
             if not placed:
@@ -966,26 +1255,32 @@ class Unit:
         if not positions:
             return False
 
-        new_base = self._create_potential_base(x, y, z, facing)
+        placed = np.asarray(positions, dtype=np.float64)
+        # Bases stacked far enough apart vertically can't collide
+        placed = placed[(z - placed[:, 2]) <= self.model_height]
+        if placed.size == 0:
+            return False
 
-        for pos in positions:
-            print(f"Checking collision: New base at ({x:.4f}, {y:.4f}, {z:.4f}) facing {facing:.2f}")
-            print(f"Against existing base at ({pos[0]:.4f}, {pos[1]:.4f}, {pos[2]:.4f}) facing {pos[3]:.2f}")
+        # Two identical bases always overlap within twice the smallest radius and never beyond twice their longest
+        # extent (a hull's half-diagonal), so only the pairs in between need the exact, angle dependent check
+        min_radius, max_radius = min(self.models[0].model_base.radius), self.models[0].model_base.longestDistance()
+        dx = x - placed[:, 0]
+        dy = y - placed[:, 1]
+        dist_sq = dx * dx + dy * dy
+        if (dist_sq <= (2 * min_radius) ** 2).any():
+            return True
+        near = dist_sq <= (2 * max_radius) ** 2
+        if not near.any():
+            return False
 
-            if (z - pos[2]) > self.model_height:
-                print(f"Quick Non-Collision Decision :: Delta Z: {z - pos[2]}, Model Height: {self.model_height}")
-                return False
-            
+        new_base = self._create_potential_base(x, y, z, facing)
+        # Most recently placed first: it is the likeliest to collide, so a rejection usually exits on the first pair
+        for pos, pos_dist_sq in zip(placed[near][::-1].tolist(), dist_sq[near][::-1].tolist()):
             other_base = self._create_potential_base(pos[0], pos[1], pos[2], pos[3])
-            
-            distance = math.sqrt((x - pos[0])**2 + (y - pos[1])**2)
             angle = get_angle(y - pos[1], x - pos[0])
             combined_radius = new_base.getRadius(angle) + other_base.getRadius(angle)
-            print(f"Distance between bases: {distance:.4f}")
-            print(f"Combined radius: {combined_radius:.4f}")
-
-            if distance <= combined_radius:
-                print(f"Collision detected!")
+            # Compare squared distances rather than taking a square root per pair
+            if pos_dist_sq <= combined_radius * combined_radius:
                 return True
         return False
 
@@ -1001,7 +1296,8 @@ class Unit:
         if current_neighbors_needed == 0:
             return True
 
-        for pos in positions:
+        # Newest models first, as the candidate was generated next to the last placed one
+        for pos in reversed(positions):
             other_base = self._create_potential_base(pos[0], pos[1], pos[2] if len(pos) > 2 else 0.0, pos[3] if len(pos) > 3 else facing)
             if new_base_shape.distance(other_base.get_base_shape()) <= self.coherency_distance:
                 found_neighbors += 1
@@ -1009,25 +1305,36 @@ class Unit:
                     return True
         return False
 
-    def _find_strategic_position(self, model: Model, placed_positions: List[Tuple[float, float, float, float]], game_map: 'Map') -> List[Tuple[float, float, float, float]]:
+    def _find_strategic_position(self, model: Model, placed_positions: List[Tuple[float, float, float, float]], game_map: 'Map', attempt: int = 0) -> Optional[Tuple[float, float, float, float]]:
+        """
+        Find the first valid position for the next model next to the last placed one. The first attempt
+        walks the fixed _PLACEMENT_DIRECTIONS; as those give the same candidates every time, later attempts
+        sample random candidates around the last placed model instead.
+        """
         last_x, last_y, last_z, facing = placed_positions[-1]
-        directions = [
-            (0, 1), (1, 1), (1, 0), (1, -1),
-            (0, -1), (-1, -1), (-1, 0), (-1, 1)
-        ]
-
-        valid_positions = []
-        for dx, dy in directions:
-            radius_at_facing = model.model_base.getRadius(angle=get_angle(dy, dx))
-            print(f"{model._id} {model.name} X: {last_x}, Y: {last_y}, Facing: {round(math.degrees(facing), 2)} :: {radius_at_facing} :: {dx} :: {dy}")
-            for distance in np.arange(radius_at_facing + 0.1, radius_at_facing + self.coherency_distance, 0.1):
-                x = last_x + distance * dx
-                y = last_y + distance * dy
-                z = last_z  # TODO - should be game_map.get_height_at(x, y)
-                
-                if self._is_valid_position(x, y, z, facing, game_map, placed_positions):
-                    valid_positions.append((x, y, z, facing))
-        return valid_positions
+        placed_xy = np.asarray(placed_positions, dtype=np.float64)[:, :2]
+        # Any candidate closer than this to a placed model certainly overlaps it (see _collides_with_unit_models)
+        min_separation_sq = (2 * min(model.model_base.radius)) ** 2
+        if attempt > 0:
+            candidates = _random_placement_candidates(last_x, last_y, 2 * min(model.model_base.radius),
+                                                      2 * max(model.model_base.radius) + self.coherency_distance,
+                                                      placed_xy, min_separation_sq)
+            return self._first_valid_position(candidates, last_z, facing, game_map, placed_positions)
+
+        radii = model.model_base.getRadius_batch(_PLACEMENT_DIRECTION_ANGLES).tolist()
+        for (dx, dy), radius_at_facing in zip(_PLACEMENT_DIRECTIONS.tolist(), radii):
+            logger.debug("%s %s X: %s, Y: %s, Facing: %s :: %s :: %s :: %s", model._id, model.name, last_x, last_y,
+                         round(math.degrees(facing), 2), radius_at_facing, dx, dy)
+
+        candidates = _placement_candidates(last_x, last_y, radii, self.coherency_distance, placed_xy, min_separation_sq)
+        return self._first_valid_position(candidates, last_z, facing, game_map, placed_positions)
+
+    def _first_valid_position(self, candidates: np.ndarray, z: float, facing: float, game_map: 'Map', placed_positions: List[Tuple[float, float, float, float]]) -> Optional[Tuple[float, float, float, float]]:
+        # TODO - z should be game_map.get_height_at(x, y)
+        for x, y in candidates.tolist():
+            if self._is_valid_position(x, y, z, facing, game_map, placed_positions):
+                return (x, y, z, facing)
+        return None
 
     def _is_valid_position(self, x: float, y: float, z: float, facing: float, game_map: 'Map', placed_positions: List[Tuple[float, float, float, float]]) -> bool:
         model = self.models[0]  # Use the first model as a reference
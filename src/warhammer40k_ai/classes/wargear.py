@@ -1,4 +1,5 @@
-from typing import Union, Dict, List, Optional
+from functools import lru_cache
+from typing import Union, Dict, Optional, Tuple, FrozenSet
 from warhammer40k_ai.utility.dice import DiceCollection
 from warhammer40k_ai.utility.range import Range
 from warhammer40k_ai.utility.count import Count
@@ -9,6 +10,9 @@ if TYPE_CHECKING:
     from .unit import Unit
 
 class WargearProfile:
+    __slots__ = ('name', 'range', 'attacks', 'skill', 'strength', 'ap', 'damage', 'keywords', 'keywords_lower',
+                 'sustained_hits', 'rapid_fire', 'anti', 'melta')
+
     def __init__(self, profile_name: str, wargear_data: Dict):
         self.name = profile_name
         self.range = self._parse_range(wargear_data.get('range', ''))
@@ -18,7 +22,12 @@ class WargearProfile:
         self.ap = self._parse_attribute(wargear_data.get('AP', ''))
         self.damage = self._parse_attribute(wargear_data.get('D', ''))
         self.keywords = self._parse_keywords(wargear_data.get('description', ''))
-    
+        self.keywords_lower = frozenset(keyword.lower() for keyword in self.keywords)
+        # Parametric weapon abilities, 0 when the profile doesn't have them
+        self.sustained_hits = self.rapid_fire = self.melta = 0
+        self.anti = ("", 0)
+        self._parse_parametric_keywords()
+
     def _parse_range(self, range_string: str) -> Range:
         if "Melee" == range_string:
             return Range.from_string("0")
@@ -37,13 +46,58 @@ class WargearProfile:
         else:
             return int(attribute_value)
 
-    def _parse_keywords(self, keywords_string):
+    def _parse_keywords(self, keywords_string) -> Tuple[str, ...]:
+        # Profiles are shared between units (see make_profile), so keep keywords immutable
         if keywords_string:
-            return [keyword.strip() for keyword in keywords_string.split(',')]
-        return []
+            return tuple(keyword.strip() for keyword in keywords_string.split(','))
+        return ()
+
+    def _parse_parametric_keywords(self) -> None:
+        # Single pass over the lowered keywords, e.g. "Sustained Hits 2" -> sustained_hits = 2
+        # (1 if no number is given) and "Anti-Infantry 4+" -> anti = ("infantry", 4).
+        # The first occurrence of each ability wins.
+        for keyword in map(str.lower, self.keywords):
+            if keyword.startswith('anti-'):
+                if not self.anti[1]:
+                    target, _, value = keyword[5:].rpartition(' ')
+                    value = value.replace('+', '')
+                    if target and value.isdigit():
+                        self.anti = (target, int(value))
+                continue
+            for attribute, prefix in _NUMBERED_KEYWORDS:
+                if keyword.startswith(prefix):
+                    if not getattr(self, attribute):
+                        value = keyword[len(prefix):].strip()
+                        setattr(self, attribute, int(value) if value.isdigit() else 1)
+                    break
+
+
+# WargearProfile attribute -> keyword prefix of the numbered weapon ability it holds
+_NUMBERED_KEYWORDS = (
+    ('sustained_hits', 'sustained hits'),
+    ('rapid_fire', 'rapid fire'),
+    ('melta', 'melta'),
+)
+
+# Datasheet fields a WargearProfile is built from
+_PROFILE_FIELDS = ('range', 'A', 'BS_WS', 'S', 'AP', 'D', 'description')
+
+def make_profile(profile_name: str, wargear_data: Dict) -> WargearProfile:
+    """Return a shared WargearProfile for the given stat line.
+
+    Profiles are never mutated after parsing, so every unit built from the same
+    datasheet can reference a single instance instead of its own copy.
+    """
+    return _make_profile(profile_name, tuple(wargear_data.get(field, '') for field in _PROFILE_FIELDS))
+
+@lru_cache(maxsize=None)
+def _make_profile(profile_name: str, profile_data: Tuple[str, ...]) -> WargearProfile:
+    return WargearProfile(profile_name, dict(zip(_PROFILE_FIELDS, profile_data)))
 
 
 class Wargear:
+    __slots__ = ('name', 'type', 'profiles', '_default')
+
     def __init__(self, wargear_data: Dict):
         self.name = wargear_data.get('name', '').replace('’', "'")
         if ' – ' in self.name:
@@ -51,52 +105,57 @@ class Wargear:
         else:
             profile_name = 'default'
         self.type = wargear_data.get('type', '')
-        self.profiles = { profile_name: WargearProfile(profile_name, wargear_data) }
+        self.profiles = { profile_name: make_profile(profile_name, wargear_data) }
+        # Profile served when no profile name is given, bound directly to skip the dict lookup
+        self._default = self.profiles[profile_name]
 
     def add_profile(self, profile_name: str, wargear_data: Dict):
-        self.profiles[profile_name] = WargearProfile(profile_name, wargear_data)
+        self.profiles[profile_name] = make_profile(profile_name, wargear_data)
+        if profile_name == 'default':
+            self._default = self.profiles[profile_name]
 
     def __str__(self):
-        str = f"{self.name} ({self.type}): "
-        for profile in self.profiles:
-            str += f"[{profile.name}: "
-            str += f"Range {self.get_range(profile.name)}, A {self.get_attacks(profile.name)}, "
-            str += f"BS/WS {self.get_skill(profile.name)}, S {self.get_strength(profile.name)}, "
-            str += f"AP {self.get_ap(profile.name)}, D {self.get_damage(profile.name)}]"
-        return str
+        parts = [f"{self.name} ({self.type}): "]
+        parts.extend(f"[{profile.name}: Range {profile.range}, A {profile.attacks}, BS/WS {profile.skill}, "
+                     f"S {profile.strength}, AP {profile.ap}, D {profile.damage}]"
+                     for profile in self.profiles.values())
+        return "".join(parts)
 
     def __repr__(self):
-        str = f"Wargear(name='{self.name}', type='{self.type}', "
-        for profile_name, profile in self.profiles.items():
-            str += f"[{profile_name}: "
-            str += f"range={profile.range!r}, attacks={profile.attacks!r}, "
-            str += f"skill={profile.skill!r}, strength={profile.strength!r}, "
-            str += f"ap={profile.ap!r}, damage={profile.damage!r}]"
-        return str + ")"
+        parts = [f"Wargear(name='{self.name}', type='{self.type}', "]
+        parts.extend(f"[{profile_name}: range={profile.range!r}, attacks={profile.attacks!r}, "
+                     f"skill={profile.skill!r}, strength={profile.strength!r}, "
+                     f"ap={profile.ap!r}, damage={profile.damage!r}]"
+                     for profile_name, profile in self.profiles.items())
+        parts.append(")")
+        return "".join(parts)
 
     def get_type(self) -> str:
         return self.type
 
     def get_range(self, profile_name: str = 'default') -> Range:
-        return self.profiles[profile_name].range
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).range
 
     def get_attacks(self, profile_name: str = 'default') -> Count:
-        return self.profiles[profile_name].attacks
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).attacks
 
     def get_skill(self, profile_name: str = 'default') -> int:
-        return self.profiles[profile_name].skill
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).skill
 
     def get_strength(self, profile_name: str = 'default') -> int:
-        return self.profiles[profile_name].strength
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).strength
 
     def get_ap(self, profile_name: str = 'default') -> int:
-        return self.profiles[profile_name].ap
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).ap
 
     def get_damage(self, profile_name: str = 'default') -> int:
-        return self.profiles[profile_name].damage
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).damage
 
-    def get_keywords(self, profile_name: str = 'default') -> List[str]:
-        return self.profiles[profile_name].keywords
+    def get_keywords(self, profile_name: str = 'default') -> Tuple[str, ...]:
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).keywords
+
+    def _kw(self, profile_name: str = 'default') -> FrozenSet[str]:
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).keywords_lower
 
     ### Wargear type checks
     def is_melee(self) -> bool:
@@ -105,88 +164,57 @@ class Wargear:
     def is_ranged(self) -> bool:
         return self.type.lower() == 'ranged'
 
-    def is_pistol(self) -> bool:
-        return 'pistol' in [keyword.lower() for keyword in self.get_keywords()]
-
-    def is_heavy(self) -> bool:
-        return 'heavy' in [keyword.lower() for keyword in self.get_keywords()]
-
-    def is_hazardous(self) -> bool:
-        return 'hazardous' in [keyword.lower() for keyword in self.get_keywords()]
-
-    def is_explosive(self) -> bool:
-        return 'explosive' in [keyword.lower() for keyword in self.get_keywords()]
-
-    def is_blast(self) -> bool:
-        return 'blast' in [keyword.lower() for keyword in self.get_keywords()]
-
-    def is_precision(self) -> bool:
-        return 'precision' in [keyword.lower() for keyword in self.get_keywords()]
-
-    def is_psychic(self) -> bool:
-        return 'psychic' in [keyword.lower() for keyword in self.get_keywords()]
+    # Boolean weapon abilities (is_pistol, is_heavy, ...) are generated from _KEYWORD_TRAITS below
 
-    def is_assault(self) -> bool:
-        return 'assault' in [keyword.lower() for keyword in self.get_keywords()]
+    def is_sustained_hits(self, profile_name: str = 'default') -> int:
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).sustained_hits
 
-    def is_torrent(self) -> bool:
-        return 'torrent' in [keyword.lower() for keyword in self.get_keywords()]
+    def is_rapid_fire(self, profile_name: str = 'default') -> int:
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).rapid_fire
 
-    def is_devastating_wounds(self) -> bool:
-        return 'devastating wounds' in [keyword.lower() for keyword in self.get_keywords()]
+    def is_melta(self, profile_name: str = 'default') -> int:
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).melta
 
-    def is_ignores_cover(self) -> bool:
-        return 'ignores cover' in [keyword.lower() for keyword in self.get_keywords()]
-
-    def is_indirect_fire(self) -> bool:
-        return 'indirect fire' in [keyword.lower() for keyword in self.get_keywords()]
-
-    def is_lethal_hits(self) -> bool:
-        return 'lethal hits' in [keyword.lower() for keyword in self.get_keywords()]
-
-    def is_extra_attacks(self) -> int:
-        return 'extra attacks' in [keyword.lower() for keyword in self.get_keywords()]
-
-    def is_sustained_hits(self) -> int:
-        for keyword in self.get_keywords():
-            if keyword.lower().startswith('sustained hits'):
-                parts = keyword.split()
-                if len(parts) > 2 and parts[2].isdigit():
-                    return int(parts[2])
-                return 1  # Default to 1 if no number is specified
-        return 0
-
-    def is_rapid_fire(self) -> int:
-        for keyword in self.get_keywords():
-            if keyword.lower().startswith('rapid fire'):
-                parts = keyword.split()
-                if len(parts) > 2 and parts[2].isdigit():
-                    return int(parts[2])
-                return 1  # Default to 1 if no number is specified
-        return 0
-
-    def is_melta(self) -> bool:
-        for keyword in self.get_keywords():
-            if keyword.lower().startswith('melta'):
-                parts = keyword.split()
-                assert len(parts) == 2
-                return parts[2]
-        return "0"
-
-    def is_anti(self):
-        for keyword in self.get_keywords():
-            if keyword.lower().startswith('anti-'):
-                parts = keyword[4:].replace('+', '').split(' ')
-                if len(parts) == 2 and parts[2].isdigit():
-                    return parts[1].lower(), int(parts[2])
-        return "", 0
+    def is_anti(self, profile_name: str = 'default') -> Tuple[str, int]:
+        return (self._default if profile_name == 'default' else self.profiles[profile_name]).anti
 
     ### Wargear actions
     def attack(self, model: 'Model', target: 'Unit') -> None:
         pass
 
 
+# Wargear method name -> weapon ability keyword it checks for
+_KEYWORD_TRAITS = {
+    'is_pistol': 'pistol',
+    'is_heavy': 'heavy',
+    'is_hazardous': 'hazardous',
+    'is_explosive': 'explosive',
+    'is_blast': 'blast',
+    'is_precision': 'precision',
+    'is_psychic': 'psychic',
+    'is_assault': 'assault',
+    'is_torrent': 'torrent',
+    'is_devastating_wounds': 'devastating wounds',
+    'is_ignores_cover': 'ignores cover',
+    'is_indirect_fire': 'indirect fire',
+    'is_lethal_hits': 'lethal hits',
+    'is_extra_attacks': 'extra attacks',
+}
+
+def _make_trait_check(name: str, keyword: str):
+    def check(self: Wargear, profile_name: str = 'default') -> bool:
+        return keyword in self._kw(profile_name)
+    check.__name__ = name
+    check.__qualname__ = f"Wargear.{name}"
+    return check
+
+for _name, _keyword in _KEYWORD_TRAITS.items():
+    setattr(Wargear, _name, _make_trait_check(_name, _keyword))
+
+
 class WargearOption:
+    __slots__ = ('wargear_name', 'model_name', 'model_quantity', 'item_quantity', 'exclude_name')
+
     def __init__(self, wargear_name: str, model_name: str, model_quantity: int, item_quantity: int, exclude_name: Optional[str] = None):
         self.wargear_name = wargear_name.lower()
         self.model_name = model_name
@@ -1,8 +1,14 @@
-from math import sqrt, atan2, pi, cos, sin
+import logging
+from math import atan2, pi, cos, sin, hypot, inf
 from typing import Tuple, List
 import heapq
+from itertools import count
+import numpy as np
+import shapely
 from ..utility.constants import MM_TO_INCHES, FREELY_CLIMBABLE_RANGE
+from ..utility.obstacle_index import ObstacleIndex
 from shapely.geometry import LineString, Point
+from shapely.geometry.base import BaseGeometry
 from shapely.affinity import translate
 
 from typing import TYPE_CHECKING
@@ -12,6 +18,8 @@ if TYPE_CHECKING:
     from ..classes.model import Model
     from ..classes.map import Map
 
+logger = logging.getLogger(__name__)
+
 
 # Convert mm (as in base size of models) to inches
 def convert_mm_to_inches(value: float) -> float:
@@ -19,7 +27,17 @@ def convert_mm_to_inches(value: float) -> float:
 
 # Determine the distance of a 3D position delta
 def get_dist(x_delta: float, y_delta: float, z_delta: float = 0) -> float:
-    return sqrt(x_delta**2 + y_delta**2 + z_delta**2)
+    return hypot(x_delta, y_delta, z_delta)
+
+# Determine the squared distance of a 3D position delta, for comparisons that don't need the distance itself
+def get_dist_sq(x_delta: float, y_delta: float, z_delta: float = 0) -> float:
+    return x_delta * x_delta + y_delta * y_delta + z_delta * z_delta
+
+# Determine the distances of many position deltas at once (element-wise over arrays)
+def get_dist_batch(x_delta: np.ndarray, y_delta: np.ndarray, z_delta: np.ndarray = None) -> np.ndarray:
+    if z_delta is None:
+        return np.hypot(x_delta, y_delta)
+    return np.hypot(np.hypot(x_delta, y_delta), z_delta)
 
 # Determine the angle between to X,Y points
 def get_angle(x_delta: float, y_delta: float) -> float:
@@ -33,6 +51,39 @@ def angle_difference(angle1: float, angle2: float) -> float:
     diff = (angle2 - angle1 + pi) % (2 * pi) - pi
     return diff
 
+def bounds_overlap(a: Tuple[float, float, float, float], b: Tuple[float, float, float, float]) -> bool:
+    """Check if two (min_x, min_y, max_x, max_y) bounding boxes overlap (touching counts)."""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+def obstacles_near(bounds: Tuple[float, float, float, float], obstacles: List['Obstacle']) -> List['Obstacle']:
+    """
+    Broad-phase for the shapely tests: return the obstacles whose bounding box overlaps bounds,
+    the only ones a shape with those bounds can intersect. Uses the tree when given an ObstacleIndex.
+    """
+    if isinstance(obstacles, ObstacleIndex):
+        return obstacles.query_bounds(bounds)
+    return [obstacle for obstacle in obstacles if bounds_overlap(bounds, obstacle.bounds)]
+
+def obstacles_intersecting(geometry: BaseGeometry, obstacles: List['Obstacle']) -> List['Obstacle']:
+    """Return the obstacles whose polygon intersects geometry, in the order of obstacles."""
+    if isinstance(obstacles, ObstacleIndex):
+        return obstacles.intersecting(geometry)
+    return [obstacle for obstacle in obstacles_near(geometry.bounds, obstacles) if geometry.intersects(obstacle.polygon)]
+
+def obstacle_collisions(geometries: np.ndarray, obstacles: List['Obstacle']) -> np.ndarray:
+    """Return a boolean array telling, for each geometry of the array, whether it intersects any obstacle."""
+    if isinstance(obstacles, ObstacleIndex):
+        return obstacles.intersects_any(geometries)
+    colliding = np.zeros(len(geometries), dtype=bool)
+    geometry_bounds = shapely.bounds(geometries)
+    for obstacle in obstacles:
+        min_x, min_y, max_x, max_y = obstacle.bounds
+        nearby = ((geometry_bounds[:, 0] <= max_x) & (min_x <= geometry_bounds[:, 2]) &
+                  (geometry_bounds[:, 1] <= max_y) & (min_y <= geometry_bounds[:, 3]))
+        if nearby.any():
+            colliding[nearby] |= shapely.intersects(geometries[nearby], obstacle.polygon)
+    return colliding
+
 def can_traverse_freely(unit: 'Unit', obstacle: 'Obstacle') -> bool:
     # Check if the unit can ignore the obstacle based on abilities
     if unit.is_flying:
@@ -40,7 +91,7 @@ def can_traverse_freely(unit: 'Unit', obstacle: 'Obstacle') -> bool:
     # Additional checks based on terrain type and unit abilities
     if obstacle.height <= FREELY_CLIMBABLE_RANGE:
         return True
-    if obstacle.terrain_type.name == 'RUINS' and (unit.is_infantry or unit.is_beast or unit.is_belisarius_cawl or unit.is_imperium_primarch):
+    if unit.can_enter_ruins and obstacle.terrain_type.name == 'RUINS':
         return True  # Infantry, beasts, Belisarius Cawl and Imperium Primarch can traverse into ruins
     # Add more rules as needed
     return False
@@ -64,21 +115,19 @@ def get_movement_cost(model: 'Model', point_a: Tuple[float, float], point_b: Tup
     dz = 0  # Initialize vertical distance
 
     # Create a line representing the movement path
-    print(f"A: {point_a}, B: {point_b}")
+    logger.debug("A: %s, B: %s", point_a, point_b)
     movement_line = LineString([point_a, point_b])
 
-    # Find obstacles that intersect the movement path
-    intersecting_obstacles = []
-    for obstacle in obstacles:
-        if movement_line.intersects(obstacle.polygon):
-            intersecting_obstacles.append(obstacle)
-
-    # Determine the maximum obstacle height along the path
+    # Determine the maximum height of the obstacles along the path the unit can't traverse freely, in the
+    # same pass that finds them (units with 'Fly' traverse every obstacle freely)
+    unit = model.parent_unit
     max_obstacle_height = 0
-    for obstacle in intersecting_obstacles:
-        if not can_traverse_freely(model.parent_unit, obstacle):
-            if obstacle.height > max_obstacle_height:
+    if not unit.is_flying:
+        for obstacle in obstacles_intersecting(movement_line, obstacles):
+            if obstacle.height > max_obstacle_height and not can_traverse_freely(unit, obstacle):
                 max_obstacle_height = obstacle.height
+                if max_obstacle_height > FREELY_CLIMBABLE_RANGE and max_obstacle_height > model.movement:
+                    return float('inf')  # Cannot traverse over the obstacle
 
     # Set vertical distance based on the highest obstacle if it's greater than the freely climbable range
     dz = max_obstacle_height if max_obstacle_height > FREELY_CLIMBABLE_RANGE else 0
@@ -100,49 +149,74 @@ def heuristic(a, b):
     return get_dist(a[0] - b[0], a[1] - b[1])
 
 def distance_to_nearest_obstacle(point, obstacles, target):
-    return min(obstacle.polygon.distance(Point(point)) for obstacle in obstacles)
+    if isinstance(obstacles, ObstacleIndex):
+        return obstacles.nearest_distance(point)
+    # Visit obstacles nearest bounding box first; once a box is further away than the best exact distance
+    # found so far, neither it nor any later obstacle can be nearer
+    px, py = point
+    lower_bounds = []
+    for obstacle in obstacles:
+        min_x, min_y, max_x, max_y = obstacle.bounds
+        dx = max(min_x - px, 0.0, px - max_x)
+        dy = max(min_y - py, 0.0, py - max_y)
+        lower_bounds.append((dx * dx + dy * dy, obstacle))
+    if not lower_bounds:
+        raise ValueError("distance_to_nearest_obstacle() without obstacles")
+    lower_bounds.sort(key=lambda entry: entry[0])
+    point_geometry = Point(point)
+    best = float('inf')
+    for lower_bound_sq, obstacle in lower_bounds:
+        if lower_bound_sq >= best * best:
+            break
+        best = min(best, obstacle.polygon.distance(point_geometry))
+    return best
 
 def adaptive_step_size(point, obstacles, target, min_step=0.1, max_step=6.0, safety_factor=0.5):
     dist = distance_to_nearest_obstacle(point, obstacles, target)
     return max(min_step, min(max_step, dist * safety_factor))
 
+# (cos, sin) of the turns move_object tries, in order, to get around an obstacle
+_AVOIDANCE_ROTATIONS = tuple((cos(angle), sin(angle)) for angle in (
+    pi/6,  # 30 degrees clockwise
+    -pi/6,  # 30 degrees counterclockwise
+    pi/3,  # 60 degrees clockwise
+    -pi/3,  # 60 degrees counterclockwise
+    pi/2,  # 90 degrees clockwise
+    -pi/2,  # 90 degrees counterclockwise
+    2*pi/3,  # 120 degrees clockwise
+    -2*pi/3,  # 120 degrees counterclockwise
+    pi,  # 180 degrees (reverse)
+))
+
 def move_object(obj, obstacles, dx, dy, step):
     """Moves an object by (dx, dy), attempting to path around obstacles."""
     new_obj = translate(obj, dx, dy)
 
     # Check for collisions
-    for obstacle in obstacles:
-        if new_obj.intersects(obstacle.polygon):
-            # Attempt to path around the obstacle
-            alternative_directions = [
-                (cos(angle) * dx - sin(angle) * dy, sin(angle) * dx + cos(angle) * dy)
-                for angle in [
-                    pi/6,  # 30 degrees clockwise
-                    -pi/6,  # 30 degrees counterclockwise
-                    pi/3,  # 60 degrees clockwise
-                    -pi/3,  # 60 degrees counterclockwise
-                    pi/2,  # 90 degrees clockwise
-                    -pi/2,  # 90 degrees counterclockwise
-                    2*pi/3,  # 120 degrees clockwise
-                    -2*pi/3,  # 120 degrees counterclockwise
-                    pi,  # 180 degrees (reverse)
-                ]
-            ]
-            
-            for alt_dx, alt_dy in alternative_directions:
-                alt_obj = translate(obj, alt_dx, alt_dy)
-                if not any(alt_obj.intersects(obs.polygon) for obs in obstacles):
-                    print(f"Collision avoided at step {step}")
-                    return alt_obj, False  # Return the alternative movement
+    if obstacles_intersecting(new_obj, obstacles):
+        # Attempt to path around the obstacle
+        alternative_directions = [
+            (cos_angle * dx - sin_angle * dy, sin_angle * dx + cos_angle * dy)
+            for cos_angle, sin_angle in _AVOIDANCE_ROTATIONS
+        ]
+        
+        for alt_dx, alt_dy in alternative_directions:
+            alt_obj = translate(obj, alt_dx, alt_dy)
+            if not obstacles_intersecting(alt_obj, obstacles):
+                logger.debug("Collision avoided at step %s", step)
+                return alt_obj, False  # Return the alternative movement
 
-            # If no alternative direction works, stay in place
-            print(f"Collision at step {step}, no alternative path found")
-            return obj, True  # Return the original object and collision flag
+        # If no alternative direction works, stay in place
+        logger.debug("Collision at step %s, no alternative path found", step)
+        return obj, True  # Return the original object and collision flag
 
     return new_obj, False
 
 def get_neighbors(current, obstacles, ellipse, goal):
-    """Get valid neighboring points with adaptive step size and direct path to goal."""
+    """
+    Get valid neighboring points with adaptive step size and direct path to goal.
+    ellipse is the model's base shape at any position; it is moved onto each neighbor by its centroid.
+    """
     x, y = current
     step_size = adaptive_step_size(current, obstacles, ellipse)
     
@@ -166,58 +240,82 @@ def get_neighbors(current, obstacles, ellipse, goal):
             (x - step_size * 0.707, y + step_size * 0.707),
         ]
     
-    valid_neighbors = []
-    for n in neighbors:
-        moved_ellipse = translate(ellipse, n[0] - ellipse.centroid.x, n[1] - ellipse.centroid.y)
-        if not any(moved_ellipse.intersects(obs.polygon) for obs in obstacles):
-            valid_neighbors.append(n)
-    return valid_neighbors
+    # Move the ellipse onto every neighbor at once and test them all against the obstacles in one pass
+    centroid = ellipse.centroid
+    offsets = np.asarray(neighbors, dtype=np.float64) - (centroid.x, centroid.y)
+    outline = np.asarray(ellipse.exterior.coords)
+    moved_ellipses = shapely.polygons(outline[None, :, :] + offsets[:, None, :])
+    colliding = obstacle_collisions(moved_ellipses, obstacles)
+    return [n for n, collides in zip(neighbors, colliding) if not collides]
+
+def _reconstruct_path(came_from, current, start, goal):
+    path = []
+    while current in came_from:
+        path.append(current)
+        current = came_from[current]
+    path.append(start)
+    return path[::-1] + [goal]  # Add the exact goal point to the end of the path
 
 def a_star(model: 'Model', obstacles, target, max_iterations=50000):
     """A* pathfinding algorithm with adaptive step size and iteration limit."""
     start = (model.model_base.x, model.model_base.y)
     goal = target[:2]
+    # The base shape is never moved: neighbors are tested by offsetting its outline (see get_neighbors) and
+    # the goal test shifts the goal into the base's frame instead, so no geometry is created per node
     ellipse = model.model_base.get_base_shape()
+    shapely.prepare(ellipse)
+    centroid_x, centroid_y = ellipse.centroid.x, ellipse.centroid.y
     
+    # Heap entries are (f_score, insertion counter, node): the counter breaks ties first-in-first-out so
+    # nodes (float tuples) are never compared, and expanded nodes are closed so stale entries are skipped
+    counter = count()
     open_set = []
-    heapq.heappush(open_set, (0, start))
+    heapq.heappush(open_set, (0, next(counter), start))
+    closed = set()
     came_from = {}
     g_score = {start: 0}
-    f_score = {start: heuristic(start, goal)}
     
     iterations = 0
     while open_set and iterations < max_iterations:
-        current = heapq.heappop(open_set)[1]
+        current = heapq.heappop(open_set)[2]
+        if current in closed:
+            continue
+        closed.add(current)
         
-        current_ellipse = translate(ellipse, current[0] - ellipse.centroid.x, current[1] - ellipse.centroid.y)
-        if current_ellipse.intersects(Point(target[:2])) or heuristic(current, goal) < 0.1:  # Changed goal condition
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            print(f"Path found after {iterations} iterations")
-            return path[::-1] + [goal]  # Add the exact goal point to the end of the path
+        if get_dist_sq(current[0] - goal[0], current[1] - goal[1]) < 0.1 * 0.1 or \
+           shapely.intersects_xy(ellipse, goal[0] - current[0] + centroid_x, goal[1] - current[1] + centroid_y):  # Changed goal condition
+            logger.debug("Path found after %s iterations", iterations)
+            return _reconstruct_path(came_from, current, start, goal)
         
-        for neighbor in get_neighbors(current, obstacles, current_ellipse, goal):
-            tentative_g_score = g_score[current] + heuristic(current, neighbor)
+        current_g_score = g_score[current]
+        for neighbor in get_neighbors(current, obstacles, ellipse, goal):
+            if neighbor in closed:
+                continue
+            tentative_g_score = current_g_score + heuristic(current, neighbor)
             
-            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+            # A single lookup serves both the "unseen" and the "better path" test
+            if tentative_g_score < g_score.get(neighbor, inf):
                 came_from[neighbor] = current
+                if neighbor == goal:
+                    # The goal is reachable in a straight step: return now rather than queue it and expand
+                    # whatever is still ahead of it in the open set
+                    logger.debug("Path found after %s iterations", iterations)
+                    return _reconstruct_path(came_from, neighbor, start, goal)
                 g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = g_score[neighbor] + heuristic(neighbor, goal)
-                heapq.heappush(open_set, (f_score[neighbor], neighbor))
+                heapq.heappush(open_set, (tentative_g_score + heuristic(neighbor, goal), next(counter), neighbor))
         
         iterations += 1
     
-    print(f"No path found after {iterations} iterations")
+    logger.debug("No path found after %s iterations", iterations)
     return None  # No path found
 
 def simplify_path(path, obstacles, ellipse, tolerance=0.1):
     """Simplify the path using the Ramer-Douglas-Peucker algorithm and additional collision checks."""
     line = LineString(path)
     simplified = list(line.simplify(tolerance).coords)
+    centroid_x, centroid_y = ellipse.centroid.x, ellipse.centroid.y
     
+    # Each (start, end) pair is tested at most once: removing a point or advancing i both yield a new pair
     i = 0
     while i < len(simplified) - 2:
         start = simplified[i]
@@ -225,11 +323,11 @@ def simplify_path(path, obstacles, ellipse, tolerance=0.1):
         
         # Check if the direct path between start and end collides with any obstacles
         test_line = LineString([start, end])
-        collision = any(test_line.intersects(obs.polygon) for obs in obstacles)
+        collision = bool(obstacles_intersecting(test_line, obstacles))
         
         if not collision:
             # Check if the ellipse moving along this path collides with any obstacles
-            test_ellipse = translate(ellipse, start[0] - ellipse.centroid.x, start[1] - ellipse.centroid.y)
+            test_ellipse = translate(ellipse, start[0] - centroid_x, start[1] - centroid_y)
             dx, dy = end[0] - start[0], end[1] - start[1]
             moved_ellipse, collision = move_object(test_ellipse, obstacles, dx, dy, i)
             
@@ -245,18 +343,17 @@ def simplify_path(path, obstacles, ellipse, tolerance=0.1):
 def can_end_move_on_terrain(model: 'Model', obstacle: 'Obstacle') -> bool:
     from ..classes.map import ObstacleType
     terrain = obstacle.terrain_type
-    base_overhang = base_overhangs_obstacle(model, obstacle)
+    # Whether the base overhangs the obstacle is only computed for the terrain types that depend on it
     if terrain in [ObstacleType.CRATER_AND_RUBBLE, ObstacleType.DEBRIS_AND_STATUARY]:
         return False  # Cannot end move on this terrain
     elif terrain == ObstacleType.HILLS_AND_SEALED_BUILDINGS:
-        return not base_overhang  # Can end move if base does not overhang
+        return not base_overhangs_obstacle(model, obstacle)  # Can end move if base does not overhang
     elif terrain == ObstacleType.WOODS:
         return True  # Can end move on this terrain
     elif terrain == ObstacleType.RUINS:
-        unit = model.parent_unit
         # TODO - not accurate, need to account for floors. All units can end move on ruins base floor
-        if unit.is_infantry or unit.is_beast or unit.is_belisarius_cawl or unit.is_imperium_primarch:
-            return not base_overhang
+        if model.parent_unit.can_enter_ruins:
+            return not base_overhangs_obstacle(model, obstacle)
         else:
             return False  # Other units cannot end move on RUINS
     else:
@@ -264,5 +361,11 @@ def can_end_move_on_terrain(model: 'Model', obstacle: 'Obstacle') -> bool:
         return True
 
 def base_overhangs_obstacle(model: 'Model', obstacle: 'Obstacle') -> bool:
-    base_shape = model.model_base.get_base_shape_at(model.model_base.x, model.model_base.y, model.model_base.facing)
-    return not obstacle.polygon.contains(base_shape) and obstacle.polygon.intersects(base_shape)
+    base = model.model_base
+    # A base whose bounding box doesn't reach the obstacle's can neither overhang nor be contained by it
+    radius = base.longestDistance()
+    if not bounds_overlap((base.x - radius, base.y - radius, base.x + radius, base.y + radius), obstacle.bounds):
+        return False
+    base_shape = base.get_base_shape_at(base.x, base.y, base.facing)
+    # The obstacle polygon is prepared (see Obstacle), so both predicates use its index
+    return obstacle.polygon.intersects(base_shape) and not obstacle.polygon.contains(base_shape)
@@ -1,5 +1,6 @@
 import typing
 from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum
 
 from .dice import DiceCollection
@@ -8,12 +9,13 @@ class CountType(Enum):
     FLAT = 1
     DICE = 2
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Count:
     ctype: CountType = CountType.FLAT
     value: typing.Union[int, DiceCollection] = 0
 
     @classmethod
+    @lru_cache(maxsize=256)
     def from_string(cls, dice_string: str) -> 'Count':
         if "D" in dice_string.upper():
             dc = DiceCollection.from_string(dice_string)
@@ -1,44 +1,47 @@
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Union
+import numpy as np
 
 # Utility Library for Dice Roll random values
 from . import RNG
 
+# Vectorised generator for rolling many dice at once (seeded from OS entropy)
+NP_RNG = np.random.default_rng()
+
 # get result of a random dice roll, defaults to D6
 
 
 def get_dice_roll(size: int = 6) -> int:
     return RNG.randint(1, size)
 
-@dataclass
+# get results of `count` random dice rolls as an array, defaults to D6
+def get_dice_rolls(count: int, size: int = 6) -> np.ndarray:
+    return NP_RNG.integers(1, size + 1, size=count)
+
+_DICE_PATTERNS = (
+    re.compile(r"(\d+)?D(\d+)(?:\s*\+\s*(\d+))?", re.IGNORECASE),
+    re.compile(r"(\d+)\s*\+\s*(\d+)?D(\d+)", re.IGNORECASE),
+)
+
+# Frozen so parsed instances can be cached and shared (see from_string)
+@dataclass(frozen=True, slots=True)
 class DiceCollection:
     number: int = 0
     die_faces: int = 0
     modifier: int = 0
 
     @classmethod
+    @lru_cache(maxsize=256)
     def from_string(cls, dice_string: str) -> 'DiceCollection':
-        d_collection = cls()
-
-        patterns = [
-            r"(\d+)?D(\d+)(?:\s*\+\s*(\d+))?",
-            r"(\d+)\s*\+\s*(\d+)?D(\d+)"
-        ]
-
-        for pattern in patterns:
-            match = re.match(pattern, dice_string, re.IGNORECASE)
+        for pattern in _DICE_PATTERNS:
+            match = pattern.match(dice_string)
             if match:
                 groups = match.groups()
-                if len(groups) == 3:
-                    d_collection.number = int(groups[0] or 1)
-                    d_collection.die_faces = int(groups[1])
-                    d_collection.modifier = int(groups[2] or 0)
-                else:
-                    d_collection.number = int(groups[1] or 1)
-                    d_collection.die_faces = int(groups[2])
-                    d_collection.modifier = int(groups[0] or 0)
-                return d_collection
+                if pattern is _DICE_PATTERNS[0]:
+                    return cls(int(groups[0] or 1), int(groups[1]), int(groups[2] or 0))
+                return cls(int(groups[1] or 1), int(groups[2]), int(groups[0] or 0))
 
         raise ValueError(f"Invalid dice string: {dice_string}")
 
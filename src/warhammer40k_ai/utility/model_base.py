@@ -2,6 +2,8 @@ import logging
 import typing
 import math
 from enum import Enum
+from functools import lru_cache
+import numpy as np
 from shapely.geometry import Point, Polygon as Poly
 from shapely import affinity
 
@@ -51,6 +53,19 @@ class BaseType(Enum):
     ELLIPTICAL = 2
     HULL = 3
 
+@lru_cache(maxsize=1024)
+def _base_shape_template(base_type: BaseType, radius: typing.Tuple[float, float], facing: float) -> Poly:
+    """
+    The base's shape centred on the origin; shared by every base of the same type, size and facing, and only
+    translated into place (see Base.get_base_shape_at). Circles are the same at any facing, so pass 0 for them.
+    """
+    if base_type in [BaseType.CIRCULAR, BaseType.ELLIPTICAL]:
+        return create_ellipse((0.0, 0.0), radius, facing)
+    elif base_type == BaseType.HULL:
+        return create_rectangle((0.0, 0.0), radius, facing)
+    else:
+        raise ValueError(f"Unknown BaseType geometry: {base_type}")
+
 class Base:
     def __init__(self, base_type: BaseType, radius: typing.Union[float, typing.Tuple[float, float]]) -> None:
         """
@@ -65,6 +80,11 @@ class Base:
         self.facing: float = 0.0
         self.base_type = base_type
         self.radius: typing.Tuple[float, float] = self._normalize_radius(radius)
+        # Ellipse terms for _get_elliptical_radius, which only ever depend on the radii
+        a, b = self.radius
+        self._ab = a * b
+        self._a2 = a * a
+        self._b2_minus_a2 = b * b - a * a
         self.set_model_height()
 
     def _normalize_radius(self, radius: typing.Union[float, typing.Tuple[float, float]]) -> typing.Tuple[float, float]:
@@ -104,11 +124,36 @@ class Base:
         else:
             raise ValueError(f"Unknown base_type: {self.base_type}")
 
+    def getRadius_batch(self, angles: np.ndarray) -> np.ndarray:
+        """Vectorized getRadius: the base's radius at each of the given angles (radians), rounded the same way."""
+        angles = np.asarray(angles, dtype=np.float64)
+        if self.base_type == BaseType.CIRCULAR:
+            return np.full(angles.shape, round(self.radius[0], 4))
+        elif self.base_type == BaseType.ELLIPTICAL:
+            c = np.cos(angles - self.facing)
+            return np.round(self._ab / np.sqrt(self._a2 + self._b2_minus_a2 * c * c), 4)
+        elif self.base_type == BaseType.HULL:
+            # Same piecewise split as _get_hull_radius: the ray leaves through a short side or a long side
+            major_axis, minor_axis = self.radius[1], self.radius[0]
+            full_angle = (math.pi - self.facing) + angles
+            corner_angle = math.atan(major_axis/minor_axis)
+            through_short_side = ((full_angle >= -corner_angle) & (full_angle < corner_angle)) | \
+                                 ((full_angle >= (math.pi - corner_angle)) & (full_angle < (math.pi + corner_angle)))
+            tan = np.tan(full_angle)
+            with np.errstate(divide='ignore'):
+                dx = np.where(through_short_side, minor_axis, major_axis / tan)
+            dy = np.where(through_short_side, minor_axis * tan, major_axis)
+            radius = np.hypot(dx, dy)
+            assert (radius > 0).all(), "bad HULL radius calculation"
+            return np.round(radius, 4)
+        else:
+            raise ValueError(f"Unknown base_type: {self.base_type}")
+
     def _get_elliptical_radius(self, angle: float) -> float:
         # Ensure angle is relative to the major axis
-        relative_angle = angle - self.facing
-        a, b = self.radius  # a is the semi-major axis, b is the semi-minor axis
-        return round((a * b) / math.sqrt((b * math.cos(relative_angle))**2 + (a * math.sin(relative_angle))**2), 4)
+        # a*b / sqrt((b*cos)^2 + (a*sin)^2), with sin^2 = 1 - cos^2 folded into the cached terms
+        c = math.cos(angle - self.facing)
+        return round(self._ab / math.sqrt(self._a2 + self._b2_minus_a2 * c * c), 4)
 
     def _get_hull_radius(self, angle: float) -> float:
         major_axis, minor_axis = self.radius[1], self.radius[0]
@@ -138,20 +183,11 @@ class Base:
 
     # Get the geometric shape of the base
     def get_base_shape(self) -> Poly:
-        if self.base_type in [BaseType.CIRCULAR, BaseType.ELLIPTICAL]:
-            return create_ellipse((self.x, self.y), self.radius, self.facing)
-        elif self.base_type == BaseType.HULL:
-            return create_rectangle((self.x, self.y), self.radius, self.facing)
-        else:
-            raise ValueError(f"Unknown BaseType geometry: {self.base_type}")
+        return self.get_base_shape_at(self.x, self.y, self.facing)
 
     def get_base_shape_at(self, x: float, y: float, facing: float) -> Poly:
-        if self.base_type in [BaseType.CIRCULAR, BaseType.ELLIPTICAL]:
-            return create_ellipse((x, y), self.radius, facing)
-        elif self.base_type == BaseType.HULL:
-            return create_rectangle((x, y), self.radius, facing)
-        else:
-            raise ValueError(f"Unknown BaseType geometry: {self.base_type}")
+        template = _base_shape_template(self.base_type, self.radius, 0.0 if self.base_type == BaseType.CIRCULAR else facing)
+        return affinity.translate(template, x, y)
 
     def __repr__(self) -> str:
         return f"Base(type={self.base_type.name}, radius={self.radius}, x={self.x}, y={self.y}, z={self.z}, facing={self.facing})"
@@ -0,0 +1,52 @@
+from typing import Iterator, List, Tuple
+import numpy as np
+from shapely import STRtree, box
+from shapely.geometry import Point
+from shapely.geometry.base import BaseGeometry
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..classes.map import Obstacle
+
+
+class ObstacleIndex:
+    """
+    STR-packed R-tree over obstacle polygons.
+
+    Iterates and sizes like the obstacle list it was built from, so it can be passed anywhere a list of
+    obstacles is expected; the helpers in calcs use the tree instead of scanning every obstacle.
+    Query results keep the order of the original list.
+    """
+    __slots__ = ('obstacles', '_tree')
+
+    def __init__(self, obstacles: List['Obstacle']) -> None:
+        self.obstacles = list(obstacles)
+        self._tree = STRtree([obstacle.polygon for obstacle in self.obstacles])
+
+    def __iter__(self) -> Iterator['Obstacle']:
+        return iter(self.obstacles)
+
+    def __len__(self) -> int:
+        return len(self.obstacles)
+
+    def query_bounds(self, bounds: Tuple[float, float, float, float]) -> List['Obstacle']:
+        """Return the obstacles whose bounding box overlaps bounds (min_x, min_y, max_x, max_y)."""
+        return [self.obstacles[i] for i in sorted(self._tree.query(box(*bounds)))]
+
+    def intersecting(self, geometry: BaseGeometry) -> List['Obstacle']:
+        """Return the obstacles whose polygon intersects geometry."""
+        return [self.obstacles[i] for i in sorted(self._tree.query(geometry, predicate='intersects'))]
+
+    def intersects_any(self, geometries: np.ndarray) -> np.ndarray:
+        """Return a boolean array telling, for each geometry of the array, whether it intersects any obstacle."""
+        colliding = np.zeros(len(geometries), dtype=bool)
+        geometry_indices, _ = self._tree.query(geometries, predicate='intersects')
+        colliding[geometry_indices] = True
+        return colliding
+
+    def nearest_distance(self, point: Tuple[float, float]) -> float:
+        """Return the distance from point to the nearest obstacle polygon."""
+        if not self.obstacles:
+            raise ValueError("nearest_distance() on an empty ObstacleIndex")
+        _, distances = self._tree.query_nearest(Point(point), return_distance=True)
+        return float(distances[0])
@@ -0,0 +1,75 @@
+from typing import Any, List, Optional, Tuple
+
+# Axis-aligned bounding box: (min_x, min_y, max_x, max_y)
+AABB = Tuple[float, float, float, float]
+
+
+def _overlaps(a: AABB, b: AABB) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class Quadtree:
+    """
+    Point-region quadtree over axis-aligned bounding boxes.
+
+    A node splits into four quadrants once it holds more than MAX_ITEMS entries (up to MAX_DEPTH levels);
+    entries that straddle a quadrant boundary, or lie outside the tree's bounds, stay on the node itself.
+    """
+    MAX_ITEMS = 4
+    MAX_DEPTH = 6
+
+    __slots__ = ('bounds', 'depth', 'items', 'children')
+
+    def __init__(self, bounds: AABB, depth: int = 0) -> None:
+        self.bounds = bounds
+        self.depth = depth
+        self.items: List[Tuple[AABB, Any]] = []
+        self.children: Optional[List['Quadtree']] = None
+
+    def insert(self, aabb: AABB, item: Any) -> None:
+        node = self
+        while node.children is not None:
+            child = node._child_containing(aabb)
+            if child is None:
+                break
+            node = child
+        node.items.append((aabb, item))
+        if node.children is None and len(node.items) > self.MAX_ITEMS and node.depth < self.MAX_DEPTH:
+            node._split()
+
+    def query_point(self, x: float, y: float) -> List[Any]:
+        """Return the items whose bounding box contains (x, y)."""
+        return self.query_rect((x, y, x, y))
+
+    def query_rect(self, aabb: AABB) -> List[Any]:
+        """Return the items whose bounding box overlaps aabb."""
+        found = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            found.extend(item for item_aabb, item in node.items if _overlaps(item_aabb, aabb))
+            if node.children is not None:
+                stack.extend(child for child in node.children if _overlaps(child.bounds, aabb))
+        return found
+
+    def _split(self) -> None:
+        min_x, min_y, max_x, max_y = self.bounds
+        mid_x, mid_y = (min_x + max_x) / 2, (min_y + max_y) / 2
+        depth = self.depth + 1
+        self.children = [
+            Quadtree((min_x, min_y, mid_x, mid_y), depth),
+            Quadtree((mid_x, min_y, max_x, mid_y), depth),
+            Quadtree((min_x, mid_y, mid_x, max_y), depth),
+            Quadtree((mid_x, mid_y, max_x, max_y), depth),
+        ]
+        items, self.items = self.items, []
+        for aabb, item in items:
+            child = self._child_containing(aabb)
+            (child.items if child is not None else self.items).append((aabb, item))
+
+    def _child_containing(self, aabb: AABB) -> Optional['Quadtree']:
+        for child in self.children:
+            cx0, cy0, cx1, cy1 = child.bounds
+            if cx0 <= aabb[0] and aabb[2] <= cx1 and cy0 <= aabb[1] and aabb[3] <= cy1:
+                return child
+        return None
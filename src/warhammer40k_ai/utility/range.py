@@ -1,8 +1,9 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Union
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Range:
     min: int
     max: int
@@ -12,6 +13,7 @@ class Range:
             raise ValueError("min value cannot be greater than max value")
 
     @classmethod
+    @lru_cache(maxsize=256)
     def from_string(cls, string: str) -> 'Range':
         parts = string.split("-")
         if len(parts) == 1:
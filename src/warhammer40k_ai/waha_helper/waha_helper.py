@@ -23,6 +23,8 @@ class WahaHelper:
         self.factions = {}
         self.detachment_abilities = {}
         self.datasheets_leaders = {}
+        # Resolved datasheets by normalized name (see get_datasheet)
+        self._datasheet_cache = {}
         self.load_data()
 
     def clean_data(self, data):
@@ -40,6 +42,7 @@ class WahaHelper:
             return data
 
     def load_data(self):
+        self._datasheet_cache.clear()
         if not os.path.exists(self.data_dir):
             print(f"Error: Directory '{self.data_dir}' does not exist.")
             return
@@ -151,9 +154,20 @@ class WahaHelper:
         """
         Returns a specific datasheet by name, using case-insensitive and partial matching.
         Also aggregates keywords and faction keywords.
+        Found datasheets are memoized per name; each call returns its own namespace with copies of the
+        top-level lists (keywords, wargear, ...), so units built from it can't change each other's.
         """
         normalized_name = self.strip_special_chars(name)
-        
+        datasheet = self._datasheet_cache.get(normalized_name)
+        if datasheet is None:
+            datasheet = self._find_datasheet(normalized_name)
+            if datasheet is None:
+                return None  # Not cached, so data loaded later can still be found
+            self._datasheet_cache[normalized_name] = datasheet
+        return SimpleNamespace(**{key: list(value) if isinstance(value, list) else value
+                                  for key, value in vars(datasheet).items()})
+
+    def _find_datasheet(self, normalized_name):
         for datasheet in self.datasheets.values():
             if 'name' in datasheet:
                 normalized_datasheet_name = self.strip_special_chars(datasheet['name'])
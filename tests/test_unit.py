@@ -1,6 +1,11 @@
 import unittest
+from unittest import mock
+import numpy as np
+from types import SimpleNamespace
 from warhammer40k_ai.waha_helper import WahaHelper
-from warhammer40k_ai.classes.unit import Unit
+from warhammer40k_ai.classes.unit import Unit, _resolve_hits
+from warhammer40k_ai.classes.map import Map, Obstacle, ObstacleType
+from warhammer40k_ai.utility import calcs
 from warhammer40k_ai.utility.calcs import convert_mm_to_inches
 import pytest
 import logging
@@ -91,5 +96,208 @@ class TestWahaHelper(unittest.TestCase):
         self.assertEqual(len(bloodletters_unit.models), 9, "Unit should still have 9 models")
         self.assertEqual(bloodletters_unit.models[0].wounds, 1, "Model should still have 1 wound")
 
+class TestResolveHits(unittest.TestCase):
+    """_resolve_hits against a three model stat block, with the dice rolls scripted or seeded."""
+
+    def resolve(self, rolls, w_cur, hits, strength=4, ap=0, damage=1, sv=(4, 4, 4), inv_sv=(0, 0, 0), t=(4, 4, 4),
+                w_max=None):
+        w_max = w_cur if w_max is None else w_max
+        with mock.patch("warhammer40k_ai.classes.unit.get_dice_rolls", side_effect=[np.array(r) for r in rolls]):
+            return _resolve_hits(np.array(t, np.int8), np.array(sv, np.int8), np.array(inv_sv, np.int8),
+                                 np.array(w_max, np.int16), np.array(w_cur, np.int16), np.array([True] * len(w_cur)),
+                                 hits, strength, ap, damage).tolist()
+
+    def test_wounded_models_are_allocated_first(self):
+        # 3 wounds, 2 failed saves: both land on the wounded model in slot 1 and destroy it
+        self.assertEqual(self.resolve([[6, 6, 6], [1, 6, 2]], [3, 2, 3], hits=3, w_max=(3, 3, 3)), [3, 0, 3])
+
+    def test_damaged_model_before_undamaged_model_with_fewer_wounds(self):
+        # A damaged 3W model (2 left) must take the attacks before an undamaged 1W model
+        self.assertEqual(self.resolve([[6], [1]], [2, 1, 1], hits=1, w_max=(3, 1, 1)), [1, 1, 1])
+        self.assertEqual(self.resolve([[6, 6, 6], [1, 1, 1]], [2, 1, 1], hits=3, w_max=(3, 1, 1)), [0, 0, 1])
+
+    def test_excess_damage_is_lost(self):
+        # Damage 3 against 2 wound models: every failed save destroys exactly one model
+        self.assertEqual(self.resolve([[6, 6], [1, 1]], [2, 2, 2], hits=2, damage=3), [0, 0, 2])
+        # Damage 2 against 3 wound models: two failed saves per model, the last one is only damaged
+        self.assertEqual(self.resolve([[6, 6, 6], [1, 1, 1]], [3, 3, 3], hits=3, damage=2), [0, 1, 3])
+
+    def test_saves_use_the_allocated_models_profile(self):
+        # Two rolls of 3: the first model (Sv 5+) fails and is destroyed, the second (Sv 3+) saves
+        self.assertEqual(self.resolve([[6, 6], [3, 3]], [1, 1, 1], hits=2, sv=(5, 3, 3)), [0, 1, 1])
+
+    def test_invulnerable_save_beats_ap(self):
+        # AP -3 turns a 3+ armour save into 6+, but the 4+ invulnerable save still saves the 4s and 5s
+        self.assertEqual(self.resolve([[6, 6, 6], [4, 5, 3]], [1, 1, 1], hits=3, ap=-3, sv=(3, 3, 3), inv_sv=(4, 4, 4)),
+                         [0, 1, 1])
+        self.assertEqual(self.resolve([[6, 6, 6], [4, 5, 3]], [1, 1, 1], hits=3, ap=-3, sv=(3, 3, 3)), [0, 0, 0])
+
+    def test_wounds_use_the_majority_toughness(self):
+        # Strength 4 wounds T4 on a 4+ but T5 only on a 5+: two T4 models out of three make the rolls of 4 wound
+        self.assertEqual(self.resolve([[4, 4], [1, 1]], [1, 1, 1], hits=2, t=(5, 4, 4)), [0, 0, 1])
+        self.assertEqual(self.resolve([[4, 4], []], [1, 1, 1], hits=2, t=(5, 5, 4)), [1, 1, 1])
+        # On a tie the highest Toughness is used (this is an approximation of the rules for mixed units)
+        self.assertEqual(self.resolve([[4, 4], []], [1, 1], hits=2, t=(4, 5), sv=(4, 4), inv_sv=(0, 0)), [1, 1])
+
+    def test_no_damage(self):
+        self.assertEqual(self.resolve([], [2, 2, 2], hits=5, damage=0), [2, 2, 2])
+        self.assertEqual(self.resolve([], [2, 2, 2], hits=0), [2, 2, 2])
+
+    def test_seeded_matches_one_attack_at_a_time(self):
+        rng = np.random.default_rng(40000)
+        for _ in range(300):
+            w_max = rng.integers(1, 4, size=3).tolist()
+            w_cur = [int(rng.integers(1, w + 1)) for w in w_max]
+            t = rng.choice([3, 4, 5], size=3).tolist()
+            sv, inv_sv = rng.integers(2, 8, size=3).tolist(), rng.choice([0, 4, 5], size=3).tolist()
+            hits, ap, damage = int(rng.integers(1, 10)), -int(rng.integers(0, 4)), int(rng.integers(1, 4))
+            wound_rolls, save_rolls = rng.integers(1, 7, size=hits), rng.integers(1, 7, size=hits)
+
+            # Reference: roll to wound against the majority Toughness (highest on a tie), then allocate each
+            # wound to the first alive model in priority order (damaged models first, then fewest wounds left)
+            # and roll its save
+            majority_toughness = max(set(t), key=lambda value: (t.count(value), value))
+            wound_target = {3: 3, 4: 4, 5: 5}[majority_toughness]  # Strength 4 against T3, T4 or T5
+            wounds = int(((wound_rolls > 1) & (wound_rolls >= wound_target)).sum())
+            result = self.resolve([wound_rolls, save_rolls[:wounds]], w_cur, hits, ap=ap, damage=damage,
+                                  sv=sv, inv_sv=inv_sv, t=t, w_max=w_max)
+
+            priority = sorted(range(3), key=lambda i: (w_cur[i] >= w_max[i], w_cur[i]))
+            expected = list(w_cur)
+            for roll in save_rolls[:wounds].tolist():
+                alive = [i for i in priority if expected[i] > 0]
+                if not alive:
+                    break
+                target = alive[0]
+                save = min(sv[target] - ap, inv_sv[target]) if inv_sv[target] else sv[target] - ap
+                if roll == 1 or roll < save:
+                    expected[target] = max(0, expected[target] - damage)
+            self.assertEqual(result, expected)
+
+
+def make_datasheet():
+    """A minimal ten model datasheet, so these tests do not need the Wahapedia data."""
+    return SimpleNamespace(
+        name="Bloodletters",
+        faction_data={"name": "Chaos Daemons"},
+        keywords=["Infantry", "Battleline", "Khorne", "Daemon"],
+        faction_keywords=["Legiones Daemonica"],
+        datasheets_unit_composition=[{"description": "1 Bloodreaper"}, {"description": "9 Bloodletters"}],
+        datasheets_models_cost=[{"description": "10 models", "cost": "110"}],
+        datasheets_models=[{"M": "6\"", "T": "4", "Sv": "7+", "inv_sv": "5", "W": "1", "Ld": "7+", "OC": "2",
+                            "base_size": "32mm"}],
+        datasheets_wargear=[{"name": "Hellblade", "type": "Melee", "range": "Melee", "A": "2", "BS_WS": "3+",
+                             "S": "5", "AP": "-2", "D": "2", "description": "lethal hits"}],
+        datasheets_options=[],
+        datasheets_abilities=[],
+    )
+
+
+class TestRemoveModel(unittest.TestCase):
+    def setUp(self):
+        self.unit = Unit(make_datasheet())
+        for i, model in enumerate(self.unit.models):
+            model.set_location(2.0 * i, 1.0 + i, 0, 0)
+
+    def assert_bookkeeping(self):
+        unit = self.unit
+        self.assertEqual(len(unit._model_rows), len(unit.models))
+        for i, model in enumerate(unit.models):
+            self.assertEqual(model._unit_index, i)
+            self.assertEqual(unit._model_rows[i], model._stat_index)
+        self.assertEqual(int(unit.model_stats["alive"].sum()), len(unit.models))
+        expected = [(model.model_base.x, model.model_base.y) for model in unit.models]
+        np.testing.assert_array_equal(unit.get_positions_array(), np.array(expected).reshape(-1, 2))
+
+    def test_remove_first_middle_and_last(self):
+        unit = self.unit
+        first, middle, last = unit.models[0], unit.models[4], unit.models[-1]
+        for model in (first, middle, last):
+            stat_index = model._stat_index
+            unit.remove_model(model)
+            self.assertNotIn(model, unit.models)
+            self.assertIsNone(model._unit_index)
+            self.assertIsNone(model._stat_index)
+            self.assertFalse(unit.model_stats["alive"][stat_index])
+            self.assert_bookkeeping()
+        self.assertEqual(len(unit.models), 7)
+        self.assertEqual(unit.models_lost, [first, middle, last])
+
+    def test_remove_all_models(self):
+        unit = self.unit
+        while unit.models:
+            unit.remove_model(unit.models[len(unit.models) // 2])
+            self.assert_bookkeeping()
+        self.assertEqual(unit.get_positions_array().shape, (0, 2))
+
+    def test_moving_a_model_after_a_removal(self):
+        unit = self.unit
+        unit.remove_model(unit.models[0])
+        moved = unit.models[0]
+        moved.set_location(30.0, 40.0, 0, 0)
+        self.assertEqual(tuple(unit.get_positions_array()[0]), (30.0, 40.0))
+        self.assert_bookkeeping()
+
+
+class TestModelStatsSync(unittest.TestCase):
+    def setUp(self):
+        self.unit = Unit(make_datasheet())
+        self.model = self.unit.models[3]
+
+    def row(self):
+        return self.unit.model_stats[self.model._stat_index]
+
+    def test_setters_write_through(self):
+        for attribute, column, value in [("movement", "M", 9), ("toughness", "T", 6), ("save", "Sv", 3),
+                                         ("leadership", "Ld", 5), ("objective_control", "OC", 4),
+                                         ("wounds", "W_cur", 0)]:
+            version = Unit.state_version
+            setattr(self.model, attribute, value)
+            self.assertEqual(getattr(self.model, attribute), value, attribute)
+            self.assertEqual(self.row()[column], value, attribute)
+            self.assertGreater(Unit.state_version, version, attribute)
+        # The other rows are left alone
+        self.assertEqual(int(self.unit.model_stats["OC"].sum()), 2 * 9 + 4)
+
+    def test_set_location_writes_through(self):
+        version = Unit.state_version
+        self.model.set_location(12.5, 7.25, 0, 0)
+        self.assertEqual((self.row()["x"], self.row()["y"]), (12.5, 7.25))
+        self.assertGreater(Unit.state_version, version)
+        self.assertEqual(tuple(self.unit.get_positions_array()[3]), (12.5, 7.25))
+
+
+class TestAStar(unittest.TestCase):
+    obstacles = [Obstacle([(14, 14), (18, 14), (18, 18), (14, 18)], ObstacleType.RUINS, 3.0),
+                 Obstacle([(20, 7), (27, 9), (29, 9), (29, 7)], ObstacleType.DEBRIS_AND_STATUARY, 6.0),
+                 Obstacle([(30, 30), (4, 2)], ObstacleType.WOODS, 1.0),
+                 Obstacle([(5, 30), (9, 30), (9, 34), (5, 34)], ObstacleType.HILLS_AND_SEALED_BUILDINGS, 8.0)]
+
+    # Path found by the original a_star (before the closed set and early exit) from (10, 10) to (12, 30)
+    baseline_path = [(10.0, 10.0), (10.2814, 12.8144), (10.4756, 14.7562), (10.651, 16.5096), (10.8176, 18.1759),
+                     (10.9762, 19.7616), (11.1503, 21.5027), (11.3749, 23.7492), (11.6894, 26.8936),
+                     (11.8938, 28.9378), (12.0, 30.0), (12.0, 30.0)]
+
+    def setUp(self):
+        self.model = Unit(make_datasheet()).models[0]
+        self.model.set_location(10, 10, 0, 0.4)
+
+    def find_path(self, obstacles, target):
+        path = calcs.a_star(self.model, obstacles, target, max_iterations=3000)
+        return None if path is None else [tuple(round(float(c), 4) for c in point) for point in path]
+
+    def test_matches_baseline(self):
+        self.assertEqual(self.find_path(self.obstacles, (12, 30, 0)), self.baseline_path)
+        # The original search also gave up on this target within 3000 iterations
+        self.assertIsNone(self.find_path(self.obstacles, (22, 22, 0)))
+
+    def test_obstacle_index_matches_obstacle_list(self):
+        game_map = Map(44, 60)
+        game_map.add_obstacles(self.obstacles)
+        index = game_map.get_obstacle_index()
+        for target in [(12, 30, 0), (40, 30, 0), (22, 22, 0)]:
+            self.assertEqual(self.find_path(index, target), self.find_path(self.obstacles, target), target)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file